@@ -0,0 +1 @@
+"""Benchmarks for the example integrations."""
@@ -0,0 +1,111 @@
+"""Shared helpers for the benchmarks.
+
+The benchmarks run the example integrations without a running Home Assistant
+instance.  They still need the homeassistant package installed (as it is in the
+HA dev container) so the integrations can be imported.
+"""
+
+import inspect
+import os
+import tempfile
+from typing import Any
+
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import CoreState
+from homeassistant.util.unit_system import METRIC_SYSTEM
+
+from msp_integration_101_intermediate.api import MOCK_DATA
+from msp_integration_101_intermediate.simulator import DeviceSimulator
+
+
+class FakeBus:
+    """Event bus that only fires when the fake hass stops."""
+
+    def __init__(self) -> None:
+        """Initialise."""
+        self.listeners: list = []
+
+    def async_listen_once(self, event_type, listener):
+        """Call the listener when the fake hass stops."""
+        self.listeners.append(listener)
+        return lambda: None
+
+
+class FakeConfig:
+    """Just enough of the HA config for entities and storage."""
+
+    units = METRIC_SYSTEM
+
+    def __init__(self, config_dir: str) -> None:
+        """Initialise."""
+        self.config_dir = config_dir
+
+    def path(self, *path: str) -> str:
+        """Return a path in the config dir."""
+        return os.path.join(self.config_dir, *path)
+
+
+class FakeHass:
+    """Just enough of HomeAssistant to run a DataUpdateCoordinator.
+
+    Executor jobs run inline so executor overhead is not measured, unless
+    inline_executor is False, ie when measuring how long the event loop is
+    blocked.
+    """
+
+    def __init__(self, loop, inline_executor: bool = True) -> None:
+        """Initialise."""
+        self.loop = loop
+        self.bus = FakeBus()
+        # Anything saved to storage goes to a temporary config dir
+        self._config_dir = tempfile.TemporaryDirectory()
+        self.config = FakeConfig(self._config_dir.name)
+        self.data: dict[str, Any] = {}
+        self.state = CoreState.running
+        self.is_stopping = False
+        self.inline_executor = inline_executor
+
+    async def async_add_executor_job(self, target, *args):
+        """Run an executor job."""
+        if self.inline_executor:
+            return target(*args)
+        return await self.loop.run_in_executor(None, target, *args)
+
+    def async_create_task(self, target, name=None, eager_start=True):
+        """Create a task."""
+        return self.loop.create_task(target, name=name)
+
+    async_create_task_internal = async_create_task
+
+    async def async_stop(self) -> None:
+        """Close anything, like the shared aiohttp session, that listens for stop."""
+        self.is_stopping = True
+        for listener in self.bus.listeners:
+            if inspect.isawaitable(result := listener(None)):
+                await result
+        self._config_dir.cleanup()
+
+
+class FakeConfigEntry:
+    """Just enough of a ConfigEntry to create a coordinator."""
+
+    def __init__(self, options: dict[str, Any] | None = None) -> None:
+        """Initialise."""
+        self.entry_id = "benchmark"
+        self.unique_id = "benchmark"
+        self.title = "Benchmark"
+        self.data = {
+            CONF_HOST: "10.10.10.1",
+            CONF_USERNAME: "test",
+            CONF_PASSWORD: "1234",
+        }
+        self.options = options or {}
+
+    def async_on_unload(self, func):
+        """Ignore unload callbacks."""
+        return func
+
+
+def make_simulator(count: int, **kwargs: Any) -> DeviceSimulator:
+    """Return a simulator of count devices shaped like the intermediate MOCK_DATA."""
+    return DeviceSimulator.generate(MOCK_DATA, count, **kwargs)
@@ -0,0 +1,134 @@
+"""Benchmark keeping devices as dicts against compact records.
+
+For each device count this shows, for the intermediate example, the memory kept
+per device, the time to read a parameter of a device (as an entity does when it
+writes its state) and the time to merge the fast tier values of every device
+into their current ones (as the coordinator does on every refresh), for device
+dicts as decoded from the api and for DeviceRecords (see records.py).
+
+It also shows the memory per device of the template and push examples' Device
+dataclass with and without slots.
+
+Run from the repository root with
+
+    python -m benchmarks.device_records
+"""
+
+from collections.abc import Callable
+from dataclasses import fields, make_dataclass
+from time import perf_counter
+import tracemalloc
+from typing import Any
+
+from msp_integration_101_intermediate.const import FAST_TIER_PARAMETERS
+from msp_integration_101_intermediate.json_codec import DEFAULT_CODEC
+from msp_integration_101_intermediate.records import DeviceRecords
+from msp_integration_101_template.api import Device, DeviceType
+
+from .common import make_simulator
+
+DEVICE_COUNTS = (1000, 10000, 100000)
+LOOKUP_PARAMETERS = ("state", "voltage", "device_type", "brightness")
+
+
+def kept_bytes(build: Callable[[], Any]) -> tuple[Any, int]:
+    """Return what build returns and the memory it keeps in bytes."""
+    tracemalloc.start()
+    result = build()
+    kept, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, kept
+
+
+def lookup_ns(devices: dict[int, Any]) -> float:
+    """Return the average ns to look up a device and read one of its parameters."""
+    device_ids = list(devices)
+    start = perf_counter()
+    for parameter in LOOKUP_PARAMETERS:
+        for device_id in device_ids:
+            devices[device_id].get(parameter)
+    return (perf_counter() - start) * 1e9 / (len(device_ids) * len(LOOKUP_PARAMETERS))
+
+
+def intermediate(device_count: int) -> None:
+    """Compare device dicts and records for the intermediate example."""
+    simulator = make_simulator(device_count, evolve_interval=0, seed=1)
+    body = DEFAULT_CODEC.dumps(simulator.get_devices())
+    # The fast tier of the next refresh, with some values moved on
+    simulator.last_evolved -= 1
+    simulator.evolve()
+    update = simulator.get_devices(FAST_TIER_PARAMETERS)
+
+    def build_dicts() -> dict[int, dict[str, Any]]:
+        return {device["device_id"]: device for device in DEFAULT_CODEC.loads(body)}
+
+    records = DeviceRecords()
+
+    def build_records() -> dict[int, Any]:
+        return {
+            device["device_id"]: records.record(device)
+            for device in DEFAULT_CODEC.loads(body)
+        }
+
+    dicts, dict_bytes = kept_bytes(build_dicts)
+    compact, record_bytes = kept_bytes(build_records)
+
+    start = perf_counter()
+    for device in update:
+        dicts[device["device_id"]] | device
+    dict_merge = perf_counter() - start
+    start = perf_counter()
+    for device in update:
+        records.merge(compact[device["device_id"]], device)
+    record_merge = perf_counter() - start
+
+    for name, devices, kept, merge in (
+        ("dicts", dicts, dict_bytes, dict_merge),
+        ("records", compact, record_bytes, record_merge),
+    ):
+        print(
+            f"{device_count:>8} {name:>8} {kept / device_count:>14.0f}"
+            f" {kept / 1024 / 1024:>8.1f} {lookup_ns(devices):>10.0f}"
+            f" {merge * 1000:>9.1f}"
+        )
+
+
+def template(device_count: int) -> None:
+    """Compare the template Device dataclass with and without slots."""
+    unslotted = make_dataclass(
+        "Device", [(field.name, field.type) for field in fields(Device)]
+    )
+    for name, device_class in (("dict", unslotted), ("slots", Device)):
+        _, kept = kept_bytes(
+            lambda device_class=device_class: [
+                device_class(
+                    device_id,
+                    f"controller_T{device_id}",
+                    DeviceType.TEMP_SENSOR,
+                    f"TempSensor{device_id}",
+                    20,
+                )
+                for device_id in range(device_count)
+            ]
+        )
+        print(f"{device_count:>8} {name:>8} {kept / device_count:>14.0f}")
+
+
+def main() -> None:
+    """Run the benchmarks for each device count."""
+    print("Intermediate example devices")
+    print(
+        f"{'devices':>8} {'store':>8} {'bytes/device':>14} {'MB':>8}"
+        f" {'lookup ns':>10} {'merge ms':>9}"
+    )
+    for device_count in DEVICE_COUNTS:
+        intermediate(device_count)
+    print()
+    print("Template and push example Device dataclass")
+    print(f"{'devices':>8} {'class':>8} {'bytes/device':>14}")
+    for device_count in DEVICE_COUNTS:
+        template(device_count)
+
+
+if __name__ == "__main__":
+    main()
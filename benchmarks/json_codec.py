@@ -0,0 +1,81 @@
+"""Benchmark the standard library json module against orjson.
+
+For each device count this times encoding the device list, decoding the whole
+response from bytes, as api.decode_response does, and decoding it a chunk at a
+time, as api.async_stream_data does.
+
+orjson is only benchmarked if it is installed.
+
+Run from the repository root with
+
+    python -m benchmarks.json_codec
+"""
+
+from collections.abc import Callable
+from time import perf_counter
+from typing import Any
+
+from msp_integration_101_intermediate.api import STREAM_CHUNK_SIZE
+from msp_integration_101_intermediate.json_codec import (
+    ORJSON_CODEC,
+    STDLIB_CODEC,
+    JSONCodec,
+)
+from msp_integration_101_intermediate.json_stream import JSONArrayStreamDecoder
+
+from .common import make_simulator
+
+DEVICE_COUNTS = (1000, 10000, 100000)
+REPEATS = 5
+MB = 1024 * 1024
+
+
+def best_time(func: Callable[[], Any]) -> float:
+    """Return the quickest of REPEATS runs of func in ms."""
+    times = []
+    for _ in range(REPEATS):
+        start = perf_counter()
+        func()
+        times.append(perf_counter() - start)
+    return min(times) * 1000
+
+
+def decode_streamed(codec: JSONCodec, chunks: list[bytes]) -> int:
+    """Decode the response a chunk at a time and return the device count."""
+    decoder = JSONArrayStreamDecoder(codec.loads)
+    count = 0
+    for chunk in chunks:
+        count += len(decoder.feed(chunk))
+    return count + len(decoder.feed(b"", final=True))
+
+
+def main() -> None:
+    """Run the benchmark for each device count and codec."""
+    codecs = [codec for codec in (STDLIB_CODEC, ORJSON_CODEC) if codec]
+    print(
+        f"{'devices':>8} {'payload MB':>11} {'codec':>7} {'encode ms':>10}"
+        f" {'decode ms':>10} {'streamed ms':>12}"
+    )
+    for device_count in DEVICE_COUNTS:
+        devices = make_simulator(device_count).get_devices()
+        body = STDLIB_CODEC.dumps(devices)
+        chunks = [
+            body[start : start + STREAM_CHUNK_SIZE]
+            for start in range(0, len(body), STREAM_CHUNK_SIZE)
+        ]
+        for codec in codecs:
+            encode = best_time(
+                lambda dumps=codec.dumps, devices=devices: dumps(devices)
+            )
+            decode = best_time(lambda loads=codec.loads, body=body: loads(body))
+            streamed = best_time(
+                lambda codec=codec, chunks=chunks: decode_streamed(codec, chunks)
+            )
+            print(
+                f"{device_count:>8} {len(body) / MB:>11.2f} {codec.name:>7}"
+                f" {encode:>10.1f} {decode:>10.1f} {streamed:>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark setting up only the intermediate platforms we have devices for.
+
+Each platform we forward costs an import of its module (and the HA entity
+component it uses, ie fan or light) plus running its async_setup_entry.  This
+compares forwarding every platform in PLATFORMS with forwarding only those from
+get_platforms, for hubs with different device types.
+
+Imports are only slow the first time, so each run is in a new python process.
+
+Run from the repository root with
+
+    python -m benchmarks.platform_setup
+"""
+
+import asyncio
+import importlib
+import json
+import statistics
+import subprocess
+import sys
+from time import perf_counter
+from typing import Any
+
+from homeassistant.helpers.entity_platform import current_platform
+
+from msp_integration_101_intermediate.api import MOCK_DATA
+
+from .common import FakeConfigEntry, FakeHass
+from .suite import FakePlatform
+
+PACKAGE = "msp_integration_101_intermediate"
+DEVICE_COUNT = 1000
+RUNS = 5
+HUBS = {
+    "all device types": None,
+    "sockets only": ("SOCKET",),
+    "sensors only": ("TEMP_SENSOR", "CONTACT_SENSOR"),
+}
+
+
+async def async_run(device_types: tuple[str, ...] | None, all_platforms: bool):
+    """Set up the platforms of a hub and return how long it took."""
+    integration = importlib.import_module(PACKAGE)
+    coordinator_module = importlib.import_module(f"{PACKAGE}.coordinator")
+    simulator_module = importlib.import_module(f"{PACKAGE}.simulator")
+
+    hass = FakeHass(asyncio.get_running_loop())
+    entry = FakeConfigEntry()
+    coordinator = coordinator_module.ExampleCoordinator(hass, entry)
+    templates = [
+        device
+        for device in MOCK_DATA
+        if device_types is None or device["device_type"] in device_types
+    ]
+    coordinator.api.simulator = simulator_module.DeviceSimulator.generate(
+        templates, DEVICE_COUNT
+    )
+    await coordinator.async_refresh()
+    entry.runtime_data = integration.RuntimeData(coordinator, lambda: None)
+
+    entities = []
+    start = perf_counter()
+    platforms = (
+        integration.PLATFORMS
+        if all_platforms
+        else integration.get_platforms(coordinator)
+    )
+    modules = [
+        importlib.import_module(f"{PACKAGE}.{platform}") for platform in platforms
+    ]
+    imported = perf_counter()
+    token = current_platform.set(FakePlatform())
+    try:
+        for module in modules:
+            await module.async_setup_entry(
+                hass, entry, lambda new_entities, *args: entities.extend(new_entities)
+            )
+    finally:
+        current_platform.reset(token)
+    finished = perf_counter()
+
+    await coordinator.async_shutdown()
+    await hass.async_stop()
+    return {
+        "platforms": len(platforms),
+        "entities": len(entities),
+        "import_seconds": imported - start,
+        "setup_seconds": finished - imported,
+    }
+
+
+def run_in_new_process(hub: str, all_platforms: bool) -> dict[str, Any]:
+    """Run a benchmark in a new python process, so imports are not cached."""
+    output = subprocess.run(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.platform_setup",
+            hub,
+            "all" if all_platforms else "needed",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main() -> None:
+    """Run the benchmarks."""
+    if len(sys.argv) == 3:
+        # A single run, in its own process
+        result = asyncio.run(async_run(HUBS[sys.argv[1]], sys.argv[2] == "all"))
+        print(json.dumps(result))
+        return
+
+    results = []
+    for hub in HUBS:
+        for all_platforms in (True, False):
+            runs = [run_in_new_process(hub, all_platforms) for _ in range(RUNS)]
+            results.append(
+                {
+                    "hub": hub,
+                    "forwarded": "all platforms" if all_platforms else "needed only",
+                    "platforms": runs[0]["platforms"],
+                    "entities": runs[0]["entities"],
+                    "import_seconds": statistics.median(
+                        run["import_seconds"] for run in runs
+                    ),
+                    "setup_seconds": statistics.median(
+                        run["setup_seconds"] for run in runs
+                    ),
+                }
+            )
+            print(
+                f"{hub:>17} | {results[-1]['forwarded']:>13} |"
+                f" {results[-1]['platforms']} platforms |"
+                f" import {results[-1]['import_seconds'] * 1000:7.1f}ms |"
+                f" setup {results[-1]['setup_seconds'] * 1000:7.1f}ms",
+                file=sys.stderr,
+            )
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
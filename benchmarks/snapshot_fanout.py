@@ -0,0 +1,93 @@
+"""Benchmark the intermediate coordinator refresh and entity fan-out.
+
+Each refresh builds the indexed device snapshot and then calls every entity's
+coordinator update handler, as the DataUpdateCoordinator would.  With O(1)
+device lookups the time per entity stays flat as the device count grows, so
+the total refresh cost scales linearly.
+
+Run from the repository root with
+
+    python -m benchmarks.snapshot_fanout
+"""
+
+import asyncio
+from time import perf_counter
+
+from msp_integration_101_intermediate.base import ExampleBaseEntity
+from msp_integration_101_intermediate.coordinator import ExampleCoordinator
+
+from .common import FakeConfigEntry, FakeHass, make_simulator
+
+DEVICE_COUNTS = (100, 1000, 5000, 10000)
+STATE_DEVICE_TYPES = (
+    "SOCKET",
+    "ON_OFF_LIGHT",
+    "DIMMABLE_LIGHT",
+    "CONTACT_SENSOR",
+    "FAN",
+)
+SENSOR_PARAMETERS = (
+    "current",
+    "energy_delivered",
+    "off_timer",
+    "temperature",
+    "voltage",
+)
+
+
+class BenchEntity(ExampleBaseEntity):
+    """Base entity that reads its properties instead of writing to hass."""
+
+    def async_write_ha_state(self) -> None:
+        """Read what a state write would read."""
+        _ = (self.unique_id, self.name, self.device_info)
+
+
+def create_entities(coordinator: ExampleCoordinator) -> list[BenchEntity]:
+    """Create the same entities the intermediate platforms would."""
+    entities = []
+    for device in coordinator.data.devices.values():
+        if device["device_type"] in STATE_DEVICE_TYPES:
+            entities.append(BenchEntity(coordinator, device, "state"))
+        entities.extend(
+            BenchEntity(coordinator, device, parameter)
+            for parameter in SENSOR_PARAMETERS
+            if device.get(parameter)
+        )
+    return entities
+
+
+async def run(device_count: int) -> tuple[int, float]:
+    """Return entity count and time of one refresh with entity fan-out."""
+    hass = FakeHass(asyncio.get_running_loop())
+    coordinator = ExampleCoordinator(hass, FakeConfigEntry())
+    # Sensor values move on every refresh, so every refresh has new data
+    coordinator.api.simulator = make_simulator(device_count, evolve_interval=0, seed=1)
+    coordinator.data = await coordinator.async_update_data()
+    entities = create_entities(coordinator)
+
+    start = perf_counter()
+    coordinator.data = await coordinator.async_update_data()
+    for entity in entities:
+        entity._handle_coordinator_update()  # noqa: SLF001
+    elapsed = perf_counter() - start
+
+    await hass.async_stop()
+    return len(entities), elapsed
+
+
+async def main() -> None:
+    """Run the benchmark for each device count."""
+    print(f"{'devices':>8} {'entities':>9} {'refresh ms':>11} {'us/entity':>10}")
+    for device_count in DEVICE_COUNTS:
+        entity_count, elapsed = min(
+            [await run(device_count) for _ in range(3)], key=lambda r: r[1]
+        )
+        print(
+            f"{device_count:>8} {entity_count:>9} {elapsed * 1000:>11.2f}"
+            f" {elapsed / entity_count * 1e6:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""Benchmark decoding the api response in one go against streaming it.
+
+Decoding the whole response needs the raw bytes, the decoded text and all the
+decoded devices in memory at once.  Streaming decodes the response a chunk at a
+time as it arrives (see json_stream.py), so only the devices we keep grow with
+the size of the response.
+
+For each device count this shows the peak memory while decoding, the memory
+kept afterwards (the devices themselves, which both need) and the time taken.
+
+Run from the repository root with
+
+    python -m benchmarks.stream_decode
+"""
+
+import json
+from time import perf_counter
+import tracemalloc
+from typing import Any
+
+from msp_integration_101_intermediate.api import STREAM_CHUNK_SIZE
+from msp_integration_101_intermediate.json_stream import JSONArrayStreamDecoder
+
+from .common import make_simulator
+
+DEVICE_COUNTS = (1000, 10000, 100000)
+MB = 1024 * 1024
+
+
+def decode_whole(chunks: list[bytes]) -> dict[int, dict[str, Any]]:
+    """Read the whole response, then decode it, as api.decode_response does."""
+    body = b"".join(chunks)
+    return {device["device_id"]: device for device in json.loads(body)}
+
+
+def decode_streamed(chunks: list[bytes]) -> dict[int, dict[str, Any]]:
+    """Decode the response a chunk at a time, as api.async_stream_data does."""
+    devices = {}
+    decoder = JSONArrayStreamDecoder()
+    for chunk in chunks:
+        for device in decoder.feed(chunk):
+            devices[device["device_id"]] = device
+    for device in decoder.feed(b"", final=True):
+        devices[device["device_id"]] = device
+    return devices
+
+
+def measure(decode, chunks: list[bytes]) -> tuple[float, float, float]:
+    """Return the peak and kept memory in MB and the time in ms of a decode."""
+    start = perf_counter()
+    decode(chunks)
+    elapsed = perf_counter() - start
+
+    tracemalloc.start()
+    devices = decode(chunks)
+    kept, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del devices
+    return peak / MB, kept / MB, elapsed * 1000
+
+
+def main() -> None:
+    """Run the benchmark for each device count."""
+    print(
+        f"{'devices':>8} {'payload MB':>11} {'method':>8} {'peak MB':>8}"
+        f" {'kept MB':>8} {'overhead MB':>12} {'ms':>8}"
+    )
+    for device_count in DEVICE_COUNTS:
+        body = json.dumps(make_simulator(device_count).get_devices()).encode()
+        # The chunks arrive from the socket one at a time, so are not counted
+        chunks = [
+            body[start : start + STREAM_CHUNK_SIZE]
+            for start in range(0, len(body), STREAM_CHUNK_SIZE)
+        ]
+        for name, decode in (("whole", decode_whole), ("streamed", decode_streamed)):
+            peak, kept, elapsed = measure(decode, chunks)
+            print(
+                f"{device_count:>8} {len(body) / MB:>11.2f} {name:>8} {peak:>8.2f}"
+                f" {kept:>8.2f} {peak - kept:>12.2f} {elapsed:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,411 @@
+"""End to end benchmarks of the three example integrations.
+
+Each integration is set up against a fake hass with a number of simulated
+devices.  Its coordinator and entity platforms are the real ones, only the
+hass state machine is replaced by a counter of state writes.
+
+For each integration and device count this measures
+
+- setup time: the first refresh, creating the entities and their first state write
+- refresh latency: a refresh (or push update) including the entity updates
+- state writes per refresh
+- peak memory allocated during setup and the refreshes (from tracemalloc, in a
+  separate run as tracing slows everything down)
+- how long the event loop was blocked, the longest single block and the total
+
+Results are printed as json, so they can be compared between commits.
+
+Run from the repository root with
+
+    python -m benchmarks.suite
+    python -m benchmarks.suite --integrations intermediate --devices 10,1000 --output results.json
+"""
+
+import argparse
+import asyncio
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+import importlib
+import json
+import platform
+import statistics
+import sys
+import tracemalloc
+from time import perf_counter
+from types import ModuleType, SimpleNamespace
+from typing import Any
+
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import current_platform
+
+from .common import FakeConfigEntry, FakeHass, make_simulator
+
+DEVICE_COUNTS = (10, 100, 1000, 10000, 50000)
+REFRESHES = 5
+# Larger device counts of an integration are skipped if, scaling the last run
+# linearly, they would take longer than this many seconds
+BUDGET = 120.0
+
+
+@dataclass
+class BenchResult:
+    """Class to hold the results of one integration at one device count."""
+
+    integration: str
+    devices: int
+    entities: int = 0
+    setup_seconds: float = 0
+    refresh_seconds: dict[str, float] = field(default_factory=dict)
+    writes_per_refresh: float = 0
+    peak_memory_bytes: int | None = None
+    loop_blocked_max_seconds: float = 0
+    loop_blocked_total_seconds: float = 0
+    skipped: str | None = None
+
+
+class FakePlatform:
+    """Entity platform that ignores entity service registrations."""
+
+    def async_register_entity_service(self, *args: Any, **kwargs: Any) -> None:
+        """Ignore the service."""
+
+
+class StateWriteCounter:
+    """Replace entity state writes with a counter.
+
+    A write still reads the properties a real write would, so entity property
+    code is measured.
+    """
+
+    def __init__(self) -> None:
+        """Initialise."""
+        self.writes = 0
+
+    def attach(self, entity: Entity, hass: FakeHass) -> None:
+        """Count the state writes of this entity."""
+        entity.hass = hass
+
+        def async_write_ha_state() -> None:
+            self.writes += 1
+            _ = (entity.available, entity.state, entity.extra_state_attributes)
+
+        entity.async_write_ha_state = async_write_ha_state
+
+
+class LoopMonitor:
+    """Measure how long the event loop is blocked.
+
+    A task sleeps for a short interval over and over.  Any time it wakes up late,
+    something was blocking the loop.
+    """
+
+    def __init__(self, interval: float = 0.001) -> None:
+        """Initialise."""
+        self.interval = interval
+        self.max_blocked = 0.0
+        self.total_blocked = 0.0
+        self._task: asyncio.Task | None = None
+
+    async def _async_monitor(self) -> None:
+        """Record how late each sleep wakes up."""
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            blocked = loop.time() - start - self.interval
+            if blocked > self.interval:
+                self.max_blocked = max(self.max_blocked, blocked)
+                self.total_blocked += blocked
+
+    async def async_start(self) -> None:
+        """Start monitoring."""
+        self._task = asyncio.create_task(self._async_monitor())
+        await asyncio.sleep(0)
+
+    async def async_settle(self) -> None:
+        """Let the monitor see the end of the last block."""
+        await asyncio.sleep(self.interval * 2)
+
+    async def async_stop(self) -> None:
+        """Stop monitoring."""
+        await self.async_settle()
+        if self._task:
+            self._task.cancel()
+
+
+class BenchIntegration:
+    """Run an example integration with simulated devices.
+
+    Subclasses set up the devices and how a refresh is triggered.
+    """
+
+    name: str
+    package: str
+
+    @contextmanager
+    def devices(self, device_count: int) -> Iterator[None]:
+        """Make the api of the integration return this many devices."""
+        yield
+
+    def create_coordinator(self, hass: FakeHass, device_count: int) -> Any:
+        """Return the coordinator of the integration."""
+        coordinator_module = importlib.import_module(f"{self.package}.coordinator")
+        return coordinator_module.ExampleCoordinator(hass, FakeConfigEntry())
+
+    async def async_refresh(self, coordinator: Any) -> float:
+        """Refresh the coordinator and return how long it took."""
+        start = perf_counter()
+        await coordinator.async_refresh()
+        return perf_counter() - start
+
+
+class IntermediateBench(BenchIntegration):
+    """The intermediate example, with the device simulator."""
+
+    name = "intermediate"
+    package = "msp_integration_101_intermediate"
+
+    def create_coordinator(self, hass: FakeHass, device_count: int) -> Any:
+        """Return the coordinator, with sensor values changing on every refresh."""
+        coordinator = super().create_coordinator(hass, device_count)
+        coordinator.api.simulator = make_simulator(
+            device_count, evolve_interval=0, seed=1
+        )
+        return coordinator
+
+
+class TemplateBench(BenchIntegration):
+    """The template example, whose api returns random values on every refresh."""
+
+    name = "template"
+    package = "msp_integration_101_template"
+
+    @contextmanager
+    def devices(self, device_count: int) -> Iterator[None]:
+        """Replace the api device list with this many devices."""
+        api = importlib.import_module(f"{self.package}.api")
+        with patch_devices(api, device_count):
+            yield
+
+
+class PushBench(TemplateBench):
+    """The push data example, sent a new device list for each refresh."""
+
+    name = "push"
+    package = "msp_push_data_example"
+
+    def create_coordinator(self, hass: FakeHass, device_count: int) -> Any:
+        """Return the coordinator, with the benchmark sending the push updates."""
+        coordinator = super().create_coordinator(hass, device_count)
+        coordinator.api.message_callback = None
+        return coordinator
+
+    async def async_refresh(self, coordinator: Any) -> float:
+        """Push a device update and return how long it took to handle."""
+        devices = coordinator.api.get_devices()
+        start = perf_counter()
+        await coordinator.devices_update_callback(devices)
+        return perf_counter() - start
+
+
+INTEGRATIONS: dict[str, BenchIntegration] = {
+    bench.name: bench for bench in (IntermediateBench(), TemplateBench(), PushBench())
+}
+
+
+@contextmanager
+def patch_devices(api: ModuleType, device_count: int) -> Iterator[None]:
+    """Replace the DEVICES list of a template style api module."""
+    original = api.DEVICES
+    device_types = [api.DeviceType.TEMP_SENSOR, api.DeviceType.DOOR_SENSOR]
+    api.DEVICES = [
+        {"id": device_id, "type": device_types[device_id % len(device_types)]}
+        for device_id in range(1, device_count + 1)
+    ]
+    try:
+        yield
+    finally:
+        api.DEVICES = original
+
+
+async def async_setup_entities(
+    bench: BenchIntegration, hass: FakeHass, coordinator: Any
+) -> list[Entity]:
+    """Set up the entity platforms of the integration and return its entities."""
+    entry = FakeConfigEntry()
+    entry.runtime_data = SimpleNamespace(coordinator=coordinator)
+    entities: list[Entity] = []
+
+    def async_add_entities(new_entities, update_before_add: bool = False) -> None:
+        entities.extend(new_entities)
+
+    token = current_platform.set(FakePlatform())
+    try:
+        for platform_name in importlib.import_module(bench.package).PLATFORMS:
+            platform_module = importlib.import_module(
+                f"{bench.package}.{platform_name}"
+            )
+            await platform_module.async_setup_entry(hass, entry, async_add_entities)
+    finally:
+        current_platform.reset(token)
+    return entities
+
+
+async def async_run(
+    bench: BenchIntegration,
+    device_count: int,
+    refreshes: int,
+    measure: Callable[[], None] | None = None,
+) -> BenchResult:
+    """Set up and refresh an integration and return the results."""
+    result = BenchResult(bench.name, device_count)
+    hass = FakeHass(asyncio.get_running_loop(), inline_executor=False)
+    counter = StateWriteCounter()
+    monitor = LoopMonitor()
+    await monitor.async_start()
+
+    with bench.devices(device_count):
+        coordinator = bench.create_coordinator(hass, device_count)
+        start = perf_counter()
+        await coordinator.async_refresh()
+        entities = await async_setup_entities(bench, hass, coordinator)
+        for entity in entities:
+            counter.attach(entity, hass)
+            coordinator.async_add_listener(
+                entity._handle_coordinator_update,  # noqa: SLF001
+                entity.coordinator_context,
+            )
+            entity.async_write_ha_state()
+        result.setup_seconds = perf_counter() - start
+        result.entities = len(entities)
+        await monitor.async_settle()
+
+        latencies = []
+        writes = counter.writes
+        for _ in range(refreshes):
+            latencies.append(await bench.async_refresh(coordinator))
+            await monitor.async_settle()
+        if measure:
+            measure()
+
+        await coordinator.async_shutdown()
+
+    await monitor.async_stop()
+    await hass.async_stop()
+
+    result.refresh_seconds = {
+        "min": min(latencies),
+        "median": statistics.median(latencies),
+        "max": max(latencies),
+    }
+    result.writes_per_refresh = (counter.writes - writes) / refreshes
+    result.loop_blocked_max_seconds = monitor.max_blocked
+    result.loop_blocked_total_seconds = monitor.total_blocked
+    return result
+
+
+async def async_peak_memory(
+    bench: BenchIntegration, device_count: int, refreshes: int
+) -> int:
+    """Return the peak memory allocated to set up and refresh an integration."""
+    peak = 0
+
+    def measure() -> None:
+        nonlocal peak
+        peak = tracemalloc.get_traced_memory()[1]
+
+    tracemalloc.start()
+    try:
+        await async_run(bench, device_count, refreshes, measure)
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+async def async_main(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the benchmarks and return the results."""
+    results = []
+    for name in args.integrations:
+        bench = INTEGRATIONS[name]
+        last_run: tuple[int, float] | None = None
+        for device_count in args.devices:
+            if (
+                last_run
+                and (estimate := last_run[1] * device_count / last_run[0]) > args.budget
+            ):
+                results.append(
+                    BenchResult(
+                        name,
+                        device_count,
+                        skipped=f"estimated {estimate:.0f}s, over the"
+                        f" {args.budget:.0f}s budget",
+                    )
+                )
+                continue
+            print(f"{name}: {device_count} devices", file=sys.stderr)
+            start = perf_counter()
+            result = await async_run(bench, device_count, args.refreshes)
+            if args.memory:
+                result.peak_memory_bytes = await async_peak_memory(
+                    bench, device_count, 1
+                )
+            results.append(result)
+            last_run = (device_count, perf_counter() - start)
+
+    return {
+        "environment": {
+            "python": platform.python_version(),
+            "homeassistant": HA_VERSION,
+            "platform": platform.platform(),
+        },
+        "refreshes": args.refreshes,
+        "results": [asdict(result) for result in results],
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    """Return the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--integrations",
+        type=lambda value: value.split(","),
+        default=list(INTEGRATIONS),
+        help=f"comma separated, from {', '.join(INTEGRATIONS)}",
+    )
+    parser.add_argument(
+        "--devices",
+        type=lambda value: [int(count) for count in value.split(",")],
+        default=list(DEVICE_COUNTS),
+        help="comma separated device counts",
+    )
+    parser.add_argument("--refreshes", type=int, default=REFRESHES)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=BUDGET,
+        help="skip device counts estimated to take longer than this many seconds",
+    )
+    parser.add_argument(
+        "--no-memory",
+        dest="memory",
+        action="store_false",
+        help="do not measure peak memory",
+    )
+    parser.add_argument("--output", help="write the json results to this file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the benchmarks."""
+    args = parse_args()
+    output = json.dumps(asyncio.run(async_main(args)), indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(output)
+    print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,16 +12,17 @@ Things you need to change
 from __future__ import annotations
 
 from collections.abc import Callable
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import logging
 
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.device_registry import DeviceEntry
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
+from .cache import SnapshotCache
 from .const import DOMAIN
 from .coordinator import ExampleCoordinator
 from .services import ExampleServicesSetup
@@ -41,6 +42,7 @@ PLATFORMS: list[Platform] = [
     Platform.SWITCH,
 ]
 
+
 type MyConfigEntry = ConfigEntry[RuntimeData]
 
 
@@ -50,6 +52,22 @@ class RuntimeData:
 
     coordinator: DataUpdateCoordinator
     cancel_update_listener: Callable
+    platforms: set[Platform] = field(default_factory=set)
+    device_types: set[str] = field(default_factory=set)
+
+
+def get_platforms(coordinator: ExampleCoordinator) -> list[Platform]:
+    """Return the platforms that have entities to create for our devices.
+
+    Only the platforms our hub has devices for are set up, as each one costs an
+    import and a setup on starting HA.  See entity_factory.py.
+    The sensor platform is always set up, for the hub diagnostic sensors.
+    """
+    return [
+        platform
+        for platform in PLATFORMS
+        if platform is Platform.SENSOR or coordinator.get_entity_descriptions(platform)
+    ]
 
 
 async def async_setup_entry(hass: HomeAssistant, config_entry: MyConfigEntry) -> bool:
@@ -62,11 +80,19 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: MyConfigEntry) ->
     coordinator = ExampleCoordinator(hass, config_entry)
 
     # ----------------------------------------------------------------------------
-    # Perform an initial data load from api.
+    # If we have saved api data from last time, create the entities from that and
+    # get live data in the background, so a slow or offline hub does not hold up
+    # starting HA.
+    # Otherwise, perform an initial data load from api.
     # async_config_entry_first_refresh() is special in that it does not log errors
     # if it fails.
     # ----------------------------------------------------------------------------
-    await coordinator.async_config_entry_first_refresh()
+    if await coordinator.async_load_cache():
+        config_entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
 
     # ----------------------------------------------------------------------------
     # Test to see if api initialised correctly, else raise ConfigNotReady to make
@@ -74,7 +100,7 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: MyConfigEntry) ->
     # Change this to match how your api will know if connected or successful
     # update.
     # ----------------------------------------------------------------------------
-    if not coordinator.data:
+    if not coordinator.data.devices:
         raise ConfigEntryNotReady
 
     # ----------------------------------------------------------------------------
@@ -95,10 +121,20 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: MyConfigEntry) ->
     config_entry.runtime_data = RuntimeData(coordinator, cancel_update_listener)
 
     # ----------------------------------------------------------------------------
-    # Setup platforms (based on the list of entity types in PLATFORMS defined above)
+    # Setup platforms (from the list of entity types in PLATFORMS defined above)
+    # that we have devices for.
     # This calls the async_setup method in each of your entity type files.
+    # If devices of a new type show up later, their platform is set up then.
     # ----------------------------------------------------------------------------
-    await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+    platforms = get_platforms(coordinator)
+    config_entry.runtime_data.platforms.update(platforms)
+    config_entry.runtime_data.device_types.update(coordinator.data.device_types)
+    await hass.config_entries.async_forward_entry_setups(config_entry, platforms)
+    config_entry.async_on_unload(
+        coordinator.async_add_listener(
+            lambda: _async_setup_new_platforms(hass, config_entry)
+        )
+    )
 
     # ----------------------------------------------------------------------------
     # Setup global services
@@ -111,6 +147,35 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: MyConfigEntry) ->
     return True
 
 
+@callback
+def _async_setup_new_platforms(hass: HomeAssistant, config_entry: MyConfigEntry):
+    """Set up any platforms that new device types from the api need.
+
+    Called from our coordinator listener created above, after every update.
+    """
+    if config_entry.state is not ConfigEntryState.LOADED:
+        # Still setting up, the next update will check again
+        return
+    runtime_data = config_entry.runtime_data
+    device_types = runtime_data.coordinator.data.device_types.keys()
+    if device_types <= runtime_data.device_types:
+        # No new device types, so no new platforms
+        return
+    runtime_data.device_types.update(device_types)
+    platforms = [
+        platform
+        for platform in get_platforms(runtime_data.coordinator)
+        if platform not in runtime_data.platforms
+    ]
+    if platforms:
+        _LOGGER.debug("Setting up platforms %s for new devices", platforms)
+        runtime_data.platforms.update(platforms)
+        config_entry.async_create_task(
+            hass,
+            hass.config_entries.async_forward_entry_setups(config_entry, platforms),
+        )
+
+
 async def _async_update_listener(hass: HomeAssistant, config_entry: ConfigEntry):
     """Handle config options update.
 
@@ -132,6 +197,11 @@ async def async_remove_config_entry_device(
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the saved api data when the integration is removed."""
+    await SnapshotCache(hass, config_entry).store.async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, config_entry: MyConfigEntry) -> bool:
     """Unload a config entry.
 
@@ -143,5 +213,7 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: MyConfigEntry) -
     for service in hass.services.async_services_for_domain(DOMAIN):
         hass.services.async_remove(DOMAIN, service)
 
-    # Unload platforms and return result
-    return await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
+    # Unload the platforms we set up and return result
+    return await hass.config_entries.async_unload_platforms(
+        config_entry, config_entry.runtime_data.platforms
+    )
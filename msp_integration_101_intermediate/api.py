@@ -4,14 +4,50 @@ You should create your api seperately and have it hosted on PYPI.  This is inclu
 of making this example code executable.
 """
 
-from copy import deepcopy
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass
+import hashlib
 import logging
+import random
+import time
 from typing import Any
 
+import aiohttp
 import requests
 
+from .circuit_breaker import CircuitBreaker
+from .json_codec import DEFAULT_CODEC, JSONCodec
+from .json_stream import JSONArrayStreamDecoder
+from .simulator import DeviceSimulator
+from .stats import DECODE_TIME, PAYLOAD_BYTES, RefreshStats
+
 _LOGGER = logging.getLogger(__name__)
 
+# Seconds to wait to connect to the api and then for each read of its response
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 10
+
+# Reads are retried this many times on a connection error, after a random delay
+# of up to RETRY_BACKOFF seconds, doubling for each retry
+RETRIES = 2
+RETRY_BACKOFF = 0.5
+
+# The circuit breaker opens after this many connection errors in a row and then
+# tries the api again after RESET_TIMEOUT seconds
+FAILURE_THRESHOLD = 3
+RESET_TIMEOUT = 30
+
+# Sent with the json we encode ourselves
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Streamed responses are read and decoded this many bytes at a time
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Streamed responses up to this many bytes are read whole and hashed before they
+# are decoded, so one that has not changed is not decoded at all
+STREAM_BUFFER_SIZE = 1024 * 1024
+
 MOCK_DATA = [
     {
         "device_id": 1,
@@ -109,115 +145,477 @@ MOCK_DATA = [
 ]
 
 
+@dataclass
+class ResponseValidators:
+    """Class to hold what we know about the last response to a request."""
+
+    etag: str | None = None
+    last_modified: str | None = None
+    payload_hash: bytes | None = None
+
+
 class API:
-    """Class for example API."""
+    """Class for example API.
 
-    def __init__(self, host: str, user: str, pwd: str, mock: bool = False) -> None:
+    If an aiohttp session is provided, the async methods use it directly on the
+    event loop.  Otherwise they fall back to running the sync methods, which use
+    requests, in the executor.
+
+    The get data methods can be passed a list of parameters to only return those
+    (and the device_id), so parameters that rarely change can be fetched less often.
+
+    Requests go via a circuit breaker, so they fail straight away while the api is
+    down.  Reads, which are safe to repeat, are retried on connection errors.
+
+    async_stream_data decodes the response as it downloads, passing on each device
+    as soon as it is decoded, so a large response is never all in memory at once.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        user: str,
+        pwd: str,
+        mock: bool = False,
+        session: aiohttp.ClientSession | None = None,
+        simulator: DeviceSimulator | None = None,
+        connect_timeout: float = CONNECT_TIMEOUT,
+        read_timeout: float = READ_TIMEOUT,
+        retries: int = RETRIES,
+        circuit_breaker: CircuitBreaker | None = None,
+        stats: RefreshStats | None = None,
+        codec: JSONCodec = DEFAULT_CODEC,
+    ) -> None:
         """Initialise."""
         self.host = host
         self.user = user
         self.pwd = pwd
 
-        # For getting and setting the mock data
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            FAILURE_THRESHOLD, RESET_TIMEOUT
+        )
+
+        # Encodes and decodes our json, with orjson if it is installed.  See
+        # json_codec.py.
+        self.codec = codec
+
+        # The size and decode time of responses are recorded here.  See stats.py.
+        self.stats = stats or RefreshStats()
+
+        # Reuse connections to the api rather than opening a new one per request.
+        self.session = session
+        self._requests_session: requests.Session | None = None
+
+        # Validators from the last response to each request, keyed by the requested
+        # parameters, so we only download and decode the data again when it has
+        # changed.
+        self._validators: dict[str, ResponseValidators] = {}
+
+        # For getting and setting the mock data.  Pass a simulator to use your own
+        # mock devices, ie DeviceSimulator.generate(MOCK_DATA, 10000) for 10k devices.
         self.mock = mock
-        self.mock_data = deepcopy(MOCK_DATA)
+        self.simulator = simulator or DeviceSimulator(MOCK_DATA)
+        self._mock_version_sent: dict[str, int] = {}
 
         # Mock auth error if user != test and pwd != 1234
         if mock and (self.user != "test" or self.pwd != "1234"):
             raise APIAuthError("Invalid credentials!")
 
-    def get_data(self) -> list[dict[str, Any]]:
-        """Get api data."""
+    @property
+    def requests_session(self) -> requests.Session:
+        """Return the requests session used by the sync methods."""
+        if self._requests_session is None:
+            self._requests_session = requests.Session()
+        return self._requests_session
+
+    @property
+    def timeout(self) -> aiohttp.ClientTimeout:
+        """Return the aiohttp timeout for a request."""
+        return aiohttp.ClientTimeout(
+            sock_connect=self.connect_timeout, sock_read=self.read_timeout
+        )
+
+    @staticmethod
+    def get_retry_delay(retry: int) -> float:
+        """Return a random delay before a retry, so retries do not all line up."""
+        return random.uniform(0, RETRY_BACKOFF * 2 ** (retry - 1))
+
+    def _check_circuit(self) -> None:
+        """Raise an error if the circuit breaker is not letting requests through."""
+        if not self.circuit_breaker.allow_request():
+            raise APICircuitOpenError(
+                f"Api unavailable after {self.circuit_breaker.failures} errors:"
+                f" {self.circuit_breaker.last_error}"
+            )
+
+    def _call[T](self, request: Callable[[], T], retries: int = 0) -> T:
+        """Send a request via the circuit breaker, retrying connection errors."""
+        attempt = 0
+        while True:
+            self._check_circuit()
+            try:
+                result = request()
+            except APIConnectionError as err:
+                self.circuit_breaker.record_failure(err)
+                if attempt == retries:
+                    raise
+                attempt += 1
+                _LOGGER.debug("Retrying api request after error: %s", err)
+                time.sleep(self.get_retry_delay(attempt))
+            except Exception:
+                # The api answered, so it is up, even if the answer was bad
+                self.circuit_breaker.record_success()
+                raise
+            else:
+                self.circuit_breaker.record_success()
+                return result
+
+    async def _async_call[T](
+        self, request: Callable[[], Awaitable[T]], retries: int = 0
+    ) -> T:
+        """Send a request via the circuit breaker, retrying connection errors."""
+        attempt = 0
+        while True:
+            self._check_circuit()
+            try:
+                result = await request()
+            except APIConnectionError as err:
+                self.circuit_breaker.record_failure(err)
+                if attempt == retries:
+                    raise
+                attempt += 1
+                _LOGGER.debug("Retrying api request after error: %s", err)
+                await asyncio.sleep(self.get_retry_delay(attempt))
+            except Exception:
+                # The api answered, so it is up, even if the answer was bad
+                self.circuit_breaker.record_success()
+                raise
+            else:
+                self.circuit_breaker.record_success()
+                return result
+
+    @staticmethod
+    def get_fields(parameters: Iterable[str] | None) -> str:
+        """Return the fields query value for a list of parameters."""
+        return ",".join(parameters) if parameters else ""
+
+    def get_query_params(self, fields: str) -> dict[str, str]:
+        """Return the query parameters for a get data request."""
+        return {"fields": fields} if fields else {}
+
+    def get_conditional_headers(self, fields: str = "") -> dict[str, str]:
+        """Return headers to ask the api to only send data if it has changed."""
+        headers = {}
+        if validators := self._validators.get(fields):
+            if validators.etag:
+                headers["If-None-Match"] = validators.etag
+            if validators.last_modified:
+                headers["If-Modified-Since"] = validators.last_modified
+        return headers
+
+    def decode_response(
+        self, status: int, headers: Mapping[str, str], body: bytes, fields: str = ""
+    ) -> list[dict[str, Any]] | None:
+        """Decode an api data response, or return None if it has not changed.
+
+        The api may answer 304 Not Modified to our conditional headers.  If it
+        does not support them, we still skip decoding an identical payload.
+        """
+        if status == 304:
+            return None
+        self.check_status(status)
+        self.stats.record(PAYLOAD_BYTES, len(body))
+        payload_hash = hashlib.blake2b(body, digest_size=16).digest()
+        if (validators := self._validators.get(fields)) and (
+            payload_hash == validators.payload_hash
+        ):
+            self.save_validators(fields, headers, payload_hash)
+            return None
+        started = time.perf_counter()
+        # Decode straight from the response bytes, without making a text copy
+        data = self.codec.loads(body)
+        self.stats.record_time(DECODE_TIME, started)
+        # Only once we know the data is good, otherwise the next request would be
+        # told it has not changed and we would never get it
+        self.save_validators(fields, headers, payload_hash)
+        return data
+
+    @staticmethod
+    def check_status(status: int) -> None:
+        """Raise an error if a get data response status is not 200 OK."""
+        if status == 200:
+            return
+        if status in (401, 403):
+            raise APIAuthError(f"Api refused our credentials ({status})")
+        if status >= 500:
+            # The hub is having problems, so this is retried like a connection error
+            raise APIConnectionError(f"Api error ({status})")
+        raise APIResponseError(f"Unexpected api response ({status})")
+
+    def save_validators(
+        self, fields: str, headers: Mapping[str, str], payload_hash: bytes
+    ) -> None:
+        """Save what we need to tell if the next response to a request has changed."""
+        validators = self._validators.setdefault(fields, ResponseValidators())
+        validators.etag = headers.get("ETag")
+        validators.last_modified = headers.get("Last-Modified")
+        validators.payload_hash = payload_hash
+
+    def get_data(
+        self, parameters: Iterable[str] | None = None
+    ) -> list[dict[str, Any]] | None:
+        """Get api data, for only these parameters if given.
+
+        Returns None if the data has not changed since the last call.
+        """
+        fields = self.get_fields(parameters)
         if self.mock:
-            return self.get_mock_data()
+            return self.get_mock_data(fields)
+        return self._call(lambda: self._get_data(fields), self.retries)
+
+    def _get_data(self, fields: str) -> list[dict[str, Any]] | None:
+        """Send a get data request."""
         try:
-            r = requests.get(f"http://{self.host}/api", timeout=10)
-            return r.json()
-        except requests.exceptions.ConnectTimeout as err:
+            r = self.requests_session.get(
+                f"http://{self.host}/api",
+                params=self.get_query_params(fields),
+                headers=self.get_conditional_headers(fields),
+                timeout=(self.connect_timeout, self.read_timeout),
+            )
+        except requests.exceptions.Timeout as err:
             raise APIConnectionError("Timeout connecting to api") from err
+        except requests.exceptions.ConnectionError as err:
+            raise APIConnectionError(f"Error connecting to api: {err}") from err
+        return self.decode_response(r.status_code, r.headers, r.content, fields)
 
     def set_data(self, device_id: int, parameter: str, value: Any) -> bool:
         """Set api data."""
+        return self.set_parameters(device_id, {parameter: value})
+
+    def set_parameters(self, device_id: int, values: dict[str, Any]) -> bool:
+        """Set many parameters of a device in one request.
+
+        The api applies all of them or none of them.
+        This is not retried, as we cannot tell if a failed request was applied.
+        """
         if self.mock:
-            return self.set_mock_data(device_id, parameter, value)
+            return self.set_mock_parameters(device_id, values)
+        return self._call(lambda: self._set_parameters(device_id, values))
+
+    def _set_parameters(self, device_id: int, values: dict[str, Any]) -> bool:
+        """Send a set data request."""
         try:
-            data = {parameter, value}
-            r = requests.post(
-                f"http://{self.host}/api/{device_id}", json=data, timeout=10
+            r = self.requests_session.post(
+                f"http://{self.host}/api/{device_id}",
+                data=self.codec.dumps(values),
+                headers=JSON_HEADERS,
+                timeout=(self.connect_timeout, self.read_timeout),
             )
-        except requests.exceptions.ConnectTimeout as err:
+        except requests.exceptions.Timeout as err:
             raise APIConnectionError("Timeout connecting to api") from err
+        except requests.exceptions.ConnectionError as err:
+            raise APIConnectionError(f"Error connecting to api: {err}") from err
         else:
             return r.status_code == 200
 
+    async def async_get_data(
+        self, parameters: Iterable[str] | None = None
+    ) -> list[dict[str, Any]] | None:
+        """Get api data, for only these parameters if given, without blocking the event loop.
+
+        Returns None if the data has not changed since the last call.
+        """
+        fields = self.get_fields(parameters)
+        if self.mock:
+            return self.get_mock_data(fields)
+        if self.session is None:
+            return await self.stats.async_run_in_executor(self.get_data, parameters)
+        return await self._async_call(
+            lambda: self._async_get_data(fields), self.retries
+        )
+
+    async def _async_get_data(self, fields: str) -> list[dict[str, Any]] | None:
+        """Send a get data request without blocking the event loop."""
+        try:
+            async with self.session.get(
+                f"http://{self.host}/api",
+                params=self.get_query_params(fields),
+                headers=self.get_conditional_headers(fields),
+                timeout=self.timeout,
+            ) as r:
+                return self.decode_response(r.status, r.headers, await r.read(), fields)
+        except TimeoutError as err:
+            raise APIConnectionError("Timeout connecting to api") from err
+        except aiohttp.ClientConnectionError as err:
+            raise APIConnectionError(f"Error connecting to api: {err}") from err
+
+    async def async_stream_data(
+        self,
+        parameters: Iterable[str] | None,
+        on_device: Callable[[dict[str, Any]], None],
+    ) -> bool:
+        """Get api data, passing each device to on_device as soon as it is decoded.
+
+        The response is decoded as it downloads, so it is never all in memory at
+        once, only the devices that on_device keeps.
+
+        Returns False if the data has not changed since the last call.  If the api
+        does not answer our conditional headers with 304, we only know that once
+        all of it has arrived.  A response up to STREAM_BUFFER_SIZE is held until
+        then, so an unchanged one is not decoded, but a larger one is decoded as it
+        arrives and on_device may already have been passed the same devices as
+        last time.  If a request is retried, the devices from the failed attempt
+        are passed again.
+        """
+        if self.mock or self.session is None:
+            if (devices := await self.async_get_data(parameters)) is None:
+                return False
+            for device in devices:
+                on_device(device)
+            return True
+        fields = self.get_fields(parameters)
+        return await self._async_call(
+            lambda: self._async_stream_data(fields, on_device), self.retries
+        )
+
+    async def _async_stream_data(
+        self, fields: str, on_device: Callable[[dict[str, Any]], None]
+    ) -> bool:
+        """Send a get data request and decode the response as it arrives."""
+        decoder = JSONArrayStreamDecoder(self.codec.loads)
+        payload_hash = hashlib.blake2b(digest_size=16)
+        size = 0
+        decode_seconds = 0.0
+
+        def decode(chunk: bytes, final: bool = False) -> None:
+            nonlocal decode_seconds
+            started = time.perf_counter()
+            devices = decoder.feed(chunk, final=final)
+            decode_seconds += time.perf_counter() - started
+            for device in devices:
+                on_device(device)
+
+        try:
+            async with self.session.get(
+                f"http://{self.host}/api",
+                params=self.get_query_params(fields),
+                headers=self.get_conditional_headers(fields),
+                timeout=self.timeout,
+            ) as r:
+                if r.status == 304:
+                    return False
+                self.check_status(r.status)
+                headers = r.headers
+                # Hold a small response until we know if it has changed
+                buffered: list[bytes] | None = (
+                    []
+                    if r.content_length is None
+                    or r.content_length <= STREAM_BUFFER_SIZE
+                    else None
+                )
+                async for chunk in r.content.iter_chunked(STREAM_CHUNK_SIZE):
+                    size += len(chunk)
+                    payload_hash.update(chunk)
+                    if buffered is None:
+                        decode(chunk)
+                        continue
+                    buffered.append(chunk)
+                    if size > STREAM_BUFFER_SIZE:
+                        # Too big to hold, so decode the rest as it arrives
+                        for buffered_chunk in buffered:
+                            decode(buffered_chunk)
+                        buffered = None
+        except TimeoutError as err:
+            raise APIConnectionError("Timeout connecting to api") from err
+        except aiohttp.ClientConnectionError as err:
+            raise APIConnectionError(f"Error connecting to api: {err}") from err
+        except aiohttp.ClientPayloadError as err:
+            # The connection dropped part way through the response
+            raise APIConnectionError(f"Error reading api response: {err}") from err
+
+        self.stats.record(PAYLOAD_BYTES, size)
+        digest = payload_hash.digest()
+        validators = self._validators.get(fields)
+        unchanged = validators is not None and digest == validators.payload_hash
+        if buffered is not None:
+            if unchanged:
+                self.save_validators(fields, headers, digest)
+                return False
+            for chunk in buffered:
+                decode(chunk)
+        decode(b"", final=True)
+        self.stats.record(DECODE_TIME, decode_seconds * 1000)
+        # Only now all of it has arrived and decoded, otherwise the next request
+        # would be told it has not changed and we would never get the rest
+        self.save_validators(fields, headers, digest)
+        return not unchanged
+
+    async def async_set_data(self, device_id: int, parameter: str, value: Any) -> bool:
+        """Set api data without blocking the event loop."""
+        return await self.async_set_parameters(device_id, {parameter: value})
+
+    async def async_set_parameters(
+        self, device_id: int, values: dict[str, Any]
+    ) -> bool:
+        """Set many parameters of a device in one request, without blocking the event loop.
+
+        The api applies all of them or none of them.
+        """
+        if self.mock:
+            return self.set_mock_parameters(device_id, values)
+        if self.session is None:
+            return await self.stats.async_run_in_executor(
+                self.set_parameters, device_id, values
+            )
+        return await self._async_call(
+            lambda: self._async_set_parameters(device_id, values)
+        )
+
+    async def _async_set_parameters(
+        self, device_id: int, values: dict[str, Any]
+    ) -> bool:
+        """Send a set data request without blocking the event loop."""
+        try:
+            async with self.session.post(
+                f"http://{self.host}/api/{device_id}",
+                data=self.codec.dumps(values),
+                headers=JSON_HEADERS,
+                timeout=self.timeout,
+            ) as r:
+                return r.status == 200
+        except TimeoutError as err:
+            raise APIConnectionError("Timeout connecting to api") from err
+        except aiohttp.ClientConnectionError as err:
+            raise APIConnectionError(f"Error connecting to api: {err}") from err
+
     # ----------------------------------------------------------------------------
     # The below methods are used to mimic a real api for the example that changes
     # its values based on commands from the switches and lights and obvioulsy will
     # not be needed wiht your real api.
     # ----------------------------------------------------------------------------
-    def get_mock_data(self) -> dict[str, Any]:
-        """Get mock api data."""
-        return self.mock_data
+    def get_mock_data(self, fields: str = "") -> list[dict[str, Any]] | None:
+        """Get mock api data.
+
+        Like a real api, this returns new device dicts each time, or None (as if
+        the api had returned 304 Not Modified) if nothing has changed.
+        """
+        self.simulator.evolve()
+        self.simulator.run_off_timers()
+        if self.simulator.version == self._mock_version_sent.get(fields):
+            return None
+        self._mock_version_sent[fields] = self.simulator.version
+        return self.simulator.get_devices(fields.split(",") if fields else None)
 
     def set_mock_data(self, device_id: int, parameter: str, value: Any) -> bool:
         """Update mock data."""
-        try:
-            device = [
-                devices
-                for devices in self.mock_data
-                if devices.get("device_id") == device_id
-            ][0]
-        except IndexError:
-            # Device id does not exist
-            return False
-
-        other_devices = [
-            devices
-            for devices in self.mock_data
-            if devices.get("device_id") != device_id
-        ]
-
-        # Modify device parameter
-        if device.get(parameter):
-            device[parameter] = value
-        else:
-            # Parameter does not exist on device
-            return False
-
-        # For sockets and lights, modify current values when off/on to mimic
-        # real api and show changing sensors from your actions.
-        if device["device_type"] in ["SOCKET", "ON_OFF_LIGHT", "DIMMABLE_LIGHT"]:
-            if value == "OFF":
-                device["current"] = 0
-            else:
-                original_device = [
-                    devices
-                    for devices in MOCK_DATA
-                    if devices.get("device_id") == device_id
-                ][0]
-                device["current"] = original_device.get("current")
-
-        # For dimmable lights if brightness is set to > 0, set to on
-        if device["device_type"] == "DIMMABLE_LIGHT":
-            if parameter == "brightness":
-                if value > 0:
-                    device["state"] = "ON"
-                    device["current"] = value * 0.015
-                else:
-                    device["state"] = "OFF"
-
-            if parameter == "state":
-                if value == "ON":
-                    device["brightness"] = 100
-                else:
-                    device["brightness"] = 0
-
-        _LOGGER.debug("Device Updated: %s", device)
-
-        # Update mock data
-        self.mock_data = other_devices
-        self.mock_data.append(device)
-        return True
+        return self.simulator.set_parameter(device_id, parameter, value)
+
+    def set_mock_parameters(self, device_id: int, values: dict[str, Any]) -> bool:
+        """Update many parameters of a mock device."""
+        return self.simulator.set_parameters(device_id, values)
 
 
 class APIAuthError(Exception):
@@ -226,3 +624,11 @@ class APIAuthError(Exception):
 
 class APIConnectionError(Exception):
     """Exception class for connection error."""
+
+
+class APIResponseError(Exception):
+    """Exception class for a response we cannot use."""
+
+
+class APICircuitOpenError(APIConnectionError):
+    """Exception class for not calling the api while it is down."""
@@ -10,6 +10,8 @@ and what additional properties and methods you need to add for each entity type.
 
 """
 
+from collections.abc import Mapping
+from dataclasses import dataclass
 import logging
 from typing import Any
 
@@ -22,6 +24,37 @@ from .coordinator import ExampleCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# The device parameters that EntityIdentity is made from
+IDENTITY_PARAMETERS = ("device_name", "device_type", "device_uid", "software_version")
+
+
+@dataclass(frozen=True, slots=True)
+class EntityIdentity:
+    """Class to hold the names and ids of an entity and its device.
+
+    These are read every time HA writes the entity state but very rarely change,
+    so we work them out once rather than on every read.
+    """
+
+    device_uid: str
+    device_name: str
+    model: str
+    sw_version: str | None
+    unique_id: str
+    name: str
+
+    @classmethod
+    def from_device(cls, device: Mapping[str, Any], parameter: str) -> "EntityIdentity":
+        """Make the identity of the entity for a parameter of a device."""
+        return cls(
+            device_uid=device.get("device_uid"),
+            device_name=device.get("device_name"),
+            model=str(device.get("device_type")).replace("_", " ").title(),
+            sw_version=device.get("software_version"),
+            unique_id=f"{DOMAIN}-{device.get('device_uid')}-{parameter}",
+            name=parameter.replace("_", " ").title(),
+        )
+
 
 class ExampleBaseEntity(CoordinatorEntity):
     """Base Entity Class.
@@ -44,27 +77,50 @@ class ExampleBaseEntity(CoordinatorEntity):
     # ----------------------------------------------------------------------------
     _attr_has_entity_name = True
 
+    # ----------------------------------------------------------------------------
+    # Any device parameters other than the entity parameter that this entity's
+    # state or attributes use.  The entity only writes its state when one of
+    # these, or its parameter, changes.
+    # ----------------------------------------------------------------------------
+    _watched_parameters: tuple[str, ...] = ()
+
     def __init__(
-        self, coordinator: ExampleCoordinator, device: dict[str, Any], parameter: str
+        self, coordinator: ExampleCoordinator, device: Mapping[str, Any], parameter: str
     ) -> None:
         """Initialise entity."""
-        super().__init__(coordinator)
+        # ----------------------------------------------------------------------------
+        # Passing the device_id as the context lets the coordinator only call
+        # entities of devices that have changed.
+        # ----------------------------------------------------------------------------
+        super().__init__(coordinator, context=device["device_id"])
         self.device = device
         self.device_id = device["device_id"]
         self.parameter = parameter
+        self.watched_parameters = frozenset((parameter, *self._watched_parameters))
+        self.identity = EntityIdentity.from_device(device, parameter)
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Update sensor with latest data from coordinator."""
         # This method is called by your DataUpdateCoordinator when a successful update runs.
+        self.update_identity()
+        if not self.coordinator.device_changed(self.device_id, self.watched_parameters):
+            # The coordinator counts the writes we skip
+            return
+        self.coordinator.entity_writes += 1
         self.device = self.coordinator.get_device(self.device_id)
         _LOGGER.debug(
-            "Updating device: %s, %s",
-            self.device_id,
-            self.coordinator.get_device_parameter(self.device_id, "device_name"),
+            "Updating device: %s, %s", self.device_id, self.identity.device_name
         )
         self.async_write_ha_state()
 
+    def update_identity(self) -> None:
+        """Make a new identity if the device name, type, uid or version changed."""
+        if not self.coordinator.device_changed(self.device_id, IDENTITY_PARAMETERS):
+            return
+        if device := self.coordinator.get_device(self.device_id):
+            self.identity = EntityIdentity.from_device(device, self.parameter)
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return device information."""
@@ -80,28 +136,25 @@ class ExampleBaseEntity(CoordinatorEntity):
         # and a device uuid, mac address or some other unique attribute.
         # ----------------------------------------------------------------------------
         return DeviceInfo(
-            name=self.coordinator.get_device_parameter(self.device_id, "device_name"),
+            name=self.identity.device_name,
             manufacturer="ACME Manufacturer",
-            model=str(
-                self.coordinator.get_device_parameter(self.device_id, "device_type")
-            )
-            .replace("_", " ")
-            .title(),
-            sw_version=self.coordinator.get_device_parameter(
-                self.device_id, "software_version"
-            ),
-            identifiers={
-                (
-                    DOMAIN,
-                    self.coordinator.get_device_parameter(self.device_id, "device_uid"),
-                )
-            },
+            model=self.identity.model,
+            sw_version=self.identity.sw_version,
+            identifiers={(DOMAIN, self.identity.device_uid)},
         )
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the extra state attributes."""
+        # Show that the state is from the cache until the api is read.
+        if self.coordinator.cache.restored:
+            return {"restored": True}
+        return None
+
     @property
     def name(self) -> str:
         """Return the name of the sensor."""
-        return self.parameter.replace("_", " ").title()
+        return self.identity.name
 
     @property
     def unique_id(self) -> str:
@@ -127,5 +180,7 @@ class ExampleBaseEntity(CoordinatorEntity):
         # f"{DOMAIN}-{HUB_MAC_ADDRESS}-{DEVICE_UID}-{ENTITY_NAME}""
         #
         # This is even more important if your integration supports multiple instances.
+        #
+        # It is made once, with the rest of the entity identity, in EntityIdentity.
         # ----------------------------------------------------------------------------
-        return f"{DOMAIN}-{self.coordinator.get_device_parameter(self.device_id, "device_uid")}-{self.parameter}"
+        return self.identity.unique_id
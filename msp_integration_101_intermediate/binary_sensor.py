@@ -6,6 +6,7 @@ from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
 )
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -30,11 +31,11 @@ async def async_setup_entry(
     # Here we are going to add some binary sensors for the contact sensors in our
     # mock data. So we add an instance of our ExampleBinarySensor class for each
     # contact sensor we have in our data.
+    # See entity_factory.py for which devices have binary sensors.
     # ----------------------------------------------------------------------------
     binary_sensors = [
-        ExampleBinarySensor(coordinator, device, "state")
-        for device in coordinator.data
-        if device.get("device_type") == "CONTACT_SENSOR"
+        ExampleBinarySensor(coordinator, entity.device, entity.parameter)
+        for entity in coordinator.get_entity_descriptions(Platform.BINARY_SENSOR)
     ]
 
     # Create the binary sensors.
@@ -0,0 +1,94 @@
+"""Cache of the last api data for our integration.
+
+Saving the last good data from the api to HA's storage means that, on the next
+start, your entities can be created straight away from it, instead of setup
+waiting for (or failing on) a slow or offline hub.  The coordinator then gets
+live data in the background.
+
+https://developers.home-assistant.io/docs/api/storage
+"""
+
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import CACHE_SAVE_DELAY, DOMAIN
+
+STORAGE_VERSION = 1
+
+
+class SnapshotCache:
+    """Save and load the last api data."""
+
+    def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+        """Initialise."""
+        self.store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}"
+        )
+        self.snapshot: Any = None
+        self.saved_at: datetime | None = None
+        # Set while entities show cached data, until the first live update
+        self.restored = False
+        self.hits = 0
+        self.misses = 0
+
+    async def async_load(self) -> Any | None:
+        """Return the cached snapshot, or None if there is not one."""
+        stored = await self.store.async_load() or {}
+        self.hits = stored.get("hits", 0)
+        self.misses = stored.get("misses", 0)
+        if stored.get("snapshot") is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.saved_at = dt_util.parse_datetime(stored["saved_at"])
+        self.snapshot = stored["snapshot"]
+        self.restored = True
+        return self.snapshot
+
+    @callback
+    def async_save(self, snapshot: Any) -> None:
+        """Save a snapshot.
+
+        Saves are delayed, so if the data changes on every update, it is only
+        written every CACHE_SAVE_DELAY seconds.  HA writes any pending save on
+        shutdown.  A dataclass snapshot is only converted to a dict when it is
+        written.
+        """
+        self.snapshot = snapshot
+        self.store.async_delay_save(self._data_to_save, CACHE_SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the data to write to storage."""
+        self.saved_at = dt_util.utcnow()
+        return {
+            "saved_at": self.saved_at.isoformat(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "snapshot": asdict(self.snapshot)
+            if is_dataclass(self.snapshot)
+            else self.snapshot,
+        }
+
+    @property
+    def age(self) -> float | None:
+        """Return the age of the cached snapshot in seconds."""
+        if self.saved_at is None:
+            return None
+        return (dt_util.utcnow() - self.saved_at).total_seconds()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the cache state for diagnostics."""
+        return {
+            "restored": self.restored,
+            "age_seconds": self.age,
+            "saved_at": self.saved_at.isoformat() if self.saved_at else None,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
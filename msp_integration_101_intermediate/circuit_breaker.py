@@ -0,0 +1,121 @@
+"""Circuit breaker for our api.
+
+If the hub is down, every request waits for its timeout before failing, so each
+poll (and each command) takes the full timeout and requests back up behind it.
+
+The circuit breaker counts failed requests.  After a number of them in a row,
+it opens and requests fail straight away without going to the hub.  After a
+while, it lets one request through (half open) to see if the hub is back.  If
+that succeeds, it closes again and requests go through as normal, otherwise it
+stays open for another while.
+
+https://martinfowler.com/bliki/CircuitBreaker.html
+"""
+
+from collections.abc import Callable
+from enum import StrEnum
+import threading
+import time
+from typing import Any
+
+
+class CircuitState(StrEnum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Fail fast while the api is down.
+
+    The api sync methods run in executor threads, so state changes are locked.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialise."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at: float | None = None
+        self.last_error: str | None = None
+        self.times_opened = 0
+        self.rejected = 0
+        # When the half open probe request was let through
+        self._probe_started: float | None = None
+        self._lock = threading.Lock()
+
+    def allow_request(self) -> bool:
+        """Return if a request can be sent to the api.
+
+        Once the reset timeout has passed, an open circuit lets one request
+        through to probe the api.  If the probe never finishes, ie it was
+        cancelled, another is let through after the reset timeout.
+        """
+        with self._lock:
+            now = self.clock()
+            if self.state is CircuitState.OPEN and (
+                now - self.opened_at >= self.reset_timeout
+            ):
+                self.state = CircuitState.HALF_OPEN
+                self._probe_started = None
+            if self.state is CircuitState.CLOSED:
+                return True
+            if self.state is CircuitState.HALF_OPEN and (
+                self._probe_started is None
+                or now - self._probe_started >= self.reset_timeout
+            ):
+                self._probe_started = now
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        with self._lock:
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+            self._probe_started = None
+
+    def record_failure(self, error: Exception) -> None:
+        """Count a failed request and open the circuit if there are too many."""
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)
+            if (
+                self.state is CircuitState.HALF_OPEN
+                or self.failures >= self.failure_threshold
+            ):
+                if self.state is not CircuitState.OPEN:
+                    self.times_opened += 1
+                self.state = CircuitState.OPEN
+                self.opened_at = self.clock()
+            self._probe_started = None
+
+    @property
+    def retry_in(self) -> float | None:
+        """Return the seconds until an open circuit will let a probe through."""
+        if self.state is not CircuitState.OPEN:
+            return None
+        return max(self.opened_at + self.reset_timeout - self.clock(), 0)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the circuit breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+            "retry_in": self.retry_in,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,144 @@
+"""Command queue for sending entity commands to our api.
+
+When a scene or automation changes lots of entities at once, each entity would
+normally send its own request to the api.  This queue collects commands for a
+short window, drops commands that a newer one for the same parameters replaces
+and then sends them, with a limited number of requests in flight at once.
+
+Each command is its own request, so the api applies all of its parameters or
+none of them, and each caller gets the result of its own command.  One caller's
+bad parameter cannot fail another caller's command.
+"""
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .api import API
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class QueuedCommand:
+    """Class to hold the queued parameter values of a command and who is waiting on it."""
+
+    values: dict[str, Any]
+    futures: list[asyncio.Future[bool]] = field(default_factory=list)
+
+
+class ExampleCommandQueue:
+    """Class to coalesce api set_data calls."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        config_entry: ConfigEntry,
+        api: API,
+        window: float,
+        max_concurrent: int,
+    ) -> None:
+        """Initialise."""
+        self.hass = hass
+        self.config_entry = config_entry
+        self.api = api
+        self.window = window
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._pending: dict[int, list[QueuedCommand]] = {}
+        self._unsub_flush: Callable | None = None
+
+    async def async_set_data(self, device_id: int, parameter: str, value: Any) -> bool:
+        """Queue a parameter change and wait for the api result."""
+        return await self.async_set_parameters(device_id, {parameter: value})
+
+    async def async_set_parameters(
+        self, device_id: int, values: dict[str, Any]
+    ) -> bool:
+        """Queue changes to many parameters of a device and wait for the api result.
+
+        They are always sent in the same request, so are applied together.
+        """
+        future: asyncio.Future[bool] = self.hass.loop.create_future()
+
+        # ----------------------------------------------------------------------------
+        # If the last command queued for this device sets the same parameters, the
+        # newer values replace the older ones and both callers get the result of
+        # the one write.  Otherwise the command is sent after those already queued.
+        # ----------------------------------------------------------------------------
+        commands = self._pending.setdefault(device_id, [])
+        if commands and commands[-1].values.keys() == values.keys():
+            command = commands[-1]
+            command.values = dict(values)
+        else:
+            command = QueuedCommand(dict(values))
+            commands.append(command)
+        command.futures.append(future)
+
+        if self._unsub_flush is None:
+            self._unsub_flush = async_call_later(self.hass, self.window, self._flush)
+
+        return await future
+
+    @callback
+    def _flush(self, _now: datetime | None = None) -> None:
+        """Send everything queued so far."""
+        self._unsub_flush = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_send(pending),
+                name=f"{self.config_entry.title} - send commands",
+            )
+
+    async def _async_send(self, pending: dict[int, list[QueuedCommand]]) -> None:
+        """Send queued commands, one task per device."""
+        _LOGGER.debug(
+            "Sending %s commands for %s devices",
+            sum(len(commands) for commands in pending.values()),
+            len(pending),
+        )
+        await asyncio.gather(
+            *(
+                self._async_send_device(device_id, commands)
+                for device_id, commands in pending.items()
+            )
+        )
+
+    async def _async_send_device(
+        self, device_id: int, commands: list[QueuedCommand]
+    ) -> None:
+        """Send the commands for one device in the order they were queued."""
+        async with self._semaphore:
+            for command in commands:
+                try:
+                    result = await self.api.async_set_parameters(
+                        device_id, command.values
+                    )
+                except Exception as err:  # pylint: disable=broad-except
+                    for future in command.futures:
+                        if not future.done():
+                            future.set_exception(err)
+                else:
+                    for future in command.futures:
+                        if not future.done():
+                            future.set_result(result)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel anything still queued."""
+        if self._unsub_flush:
+            self._unsub_flush()
+            self._unsub_flush = None
+        pending, self._pending = self._pending, {}
+        for commands in pending.values():
+            for command in commands:
+                for future in command.futures:
+                    future.cancel()
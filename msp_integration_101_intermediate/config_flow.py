@@ -32,10 +32,16 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.selector import selector
 
 from .api import API, APIAuthError, APIConnectionError
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN, MIN_SCAN_INTERVAL
+from .const import (
+    CONF_ADAPTIVE_POLLING,
+    DEFAULT_SCAN_INTERVAL,
+    DOMAIN,
+    MIN_SCAN_INTERVAL,
+)
 from .coordinator import ExampleCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -83,12 +89,19 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     """
     try:
         # ----------------------------------------------------------------------------
-        # If your api is not async, use the executor to access it
+        # Our api is async when given HA's shared aiohttp session, so we can await
+        # it directly.  If your api is not async, use the executor to access it.
         # If you cannot connect, raise CannotConnect
         # If the authentication is wrong, raise InvalidAuth
         # ----------------------------------------------------------------------------
-        api = API(data[CONF_HOST], data[CONF_USERNAME], data[CONF_PASSWORD], mock=True)
-        await hass.async_add_executor_job(api.get_data)
+        api = API(
+            data[CONF_HOST],
+            data[CONF_USERNAME],
+            data[CONF_PASSWORD],
+            mock=True,
+            session=async_get_clientsession(hass),
+        )
+        await api.async_get_data()
     except APIAuthError as err:
         raise InvalidAuth from err
     except APIConnectionError as err:
@@ -301,6 +314,10 @@ class ExampleOptionsFlowHandler(OptionsFlow):
                     CONF_SCAN_INTERVAL,
                     default=self.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
                 ): (vol.All(vol.Coerce(int), vol.Clamp(min=MIN_SCAN_INTERVAL))),
+                vol.Optional(
+                    CONF_ADAPTIVE_POLLING,
+                    default=self.options.get(CONF_ADAPTIVE_POLLING, False),
+                ): bool,
                 vol.Optional(
                     CONF_DESCRIPTION,
                     default=self.options.get(CONF_DESCRIPTION),
@@ -322,7 +339,7 @@ class ExampleOptionsFlowHandler(OptionsFlow):
         coordinator: ExampleCoordinator = self.hass.data[DOMAIN][
             self.config_entry.entry_id
         ].coordinator
-        devices = coordinator.data
+        devices = list(coordinator.data.devices.values())
         data_schema = vol.Schema(
             {
                 vol.Optional(CONF_CHOOSE, default=devices[0]["device_name"]): selector(
@@ -5,8 +5,68 @@ DOMAIN = "msp_integration_101_intermediate"
 DEFAULT_SCAN_INTERVAL = 60
 MIN_SCAN_INTERVAL = 10
 
+# Adaptive polling polls faster while devices change and backs off to this maximum
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+MAX_SCAN_INTERVAL = 300
+ADAPTIVE_BACKOFF_FACTOR = 2
+ADAPTIVE_HISTORY_SIZE = 20
+
+# Parameters are polled in tiers.  The fast tier is polled every scan interval and
+# the slow tier, for parameters that rarely change, every SLOW_TIER_INTERVAL seconds.
+# Parameters that are not in a tier are not fetched.
+FAST_TIER_PARAMETERS = (
+    "state",
+    "voltage",
+    "current",
+    "energy_delivered",
+    "brightness",
+    "off_timer",
+    "temperature",
+    "oscillating",
+    "speed",
+)
+SLOW_TIER_PARAMETERS = (
+    "device_type",
+    "device_name",
+    "device_uid",
+    "software_version",
+    "last_reboot",
+)
+SLOW_TIER_INTERVAL = 3600
+
+# Parameters with only a few different values across all devices.  Every device
+# shares one copy of each of their values.  See records.py.
+INTERNED_PARAMETERS = (
+    "device_type",
+    "software_version",
+    "state",
+    "off_timer",
+)
+
 RENAME_DEVICE_SERVICE_NAME = "rename_device_service"
+RENAME_DEVICES_SERVICE_NAME = "rename_devices_service"
 RESPONSE_SERVICE_NAME = "response_service"
 
 SET_OFF_TIMER_ENTITY_SERVICE_NAME = "set_off_timer"
 CONF_OFF_TIME = "off_time"
+
+# Active off timers are counted down locally, in a timer wheel with this many
+# one second slots.  See timers.py.
+OFF_TIMER_WHEEL_SLOTS = 60
+
+# Commands sent within this many seconds of each other are sent together
+COMMAND_QUEUE_WINDOW = 0.05
+MAX_CONCURRENT_COMMANDS = 10
+
+# Wait this many seconds after the api data changes before saving it to the cache
+CACHE_SAVE_DELAY = 60
+
+# How often, in seconds, energy sensors update between polls.  See energy.py.
+ENERGY_UPDATE_INTERVAL = 5
+
+# How long a device has to report a commanded value before it is rolled back
+OPTIMISTIC_TIMEOUT = 30
+
+# A refresh asked for within this many seconds of one starting shares it, later
+# ones wait for it to finish and share one more refresh
+REFRESH_JOIN_WINDOW = 0.5
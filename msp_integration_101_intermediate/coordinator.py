@@ -1,7 +1,12 @@
 """DataUpdateCoordinator for our integration."""
 
+import asyncio
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
 from datetime import timedelta
 import logging
+import math
+import time
 from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
@@ -10,20 +15,105 @@ from homeassistant.const import (
     CONF_PASSWORD,
     CONF_SCAN_INTERVAL,
     CONF_USERNAME,
+    Platform,
 )
-from homeassistant.core import DOMAIN, HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, DOMAIN, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import API, APIConnectionError
-from .const import DEFAULT_SCAN_INTERVAL
+from .cache import SnapshotCache
+from .commands import ExampleCommandQueue
+from .const import (
+    COMMAND_QUEUE_WINDOW,
+    CONF_ADAPTIVE_POLLING,
+    DEFAULT_SCAN_INTERVAL,
+    ENERGY_UPDATE_INTERVAL,
+    MAX_CONCURRENT_COMMANDS,
+    OPTIMISTIC_TIMEOUT,
+    REFRESH_JOIN_WINDOW,
+)
+from .energy import EnergyIntegrator
+from .entity_factory import DeviceParameter, classify_devices
+from .polling import AdaptivePolling, PollingTier, TieredPolling
+from .records import DeviceRecord, DeviceRecords
+from .stats import (
+    DEVICE_COUNT,
+    ENTITY_WRITES,
+    FETCH_TIME,
+    UPDATE_ENTITIES_TIME,
+    RefreshStats,
+)
+from .timers import OffTimerWheel, parse_off_timer
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class ExampleAPIData:
+    """Class to hold api data.
+
+    The api returns a list of devices.  Searching that list every time an entity
+    wants its value gets very slow with lots of devices, so we index it once per
+    update and every lookup after that is a simple dictionary access.
+
+    The devices are kept as compact records rather than dicts.  See records.py.
+    """
+
+    devices: dict[int, DeviceRecord] = field(default_factory=dict)
+    device_uids: dict[str, DeviceRecord] = field(default_factory=dict)
+    device_types: dict[str, list[DeviceRecord]] = field(default_factory=dict)
+
+    @classmethod
+    def from_devices(cls, devices: Iterable[DeviceRecord]) -> "ExampleAPIData":
+        """Build an indexed snapshot from the api device list."""
+        data = cls()
+        for device in devices:
+            data.devices[device["device_id"]] = device
+            if device_uid := device.get("device_uid"):
+                data.device_uids[device_uid] = device
+            data.device_types.setdefault(device.get("device_type"), []).append(device)
+        return data
+
+
+def get_changed_parameters(
+    old: ExampleAPIData | None, new: ExampleAPIData
+) -> dict[int, set[str]] | None:
+    """Return the parameters that differ between two updates, keyed by device_id.
+
+    Returns None if there is no previous update to compare with.
+    """
+    if old is None:
+        return None
+    changed: dict[int, set[str]] = {}
+    for device_id, device in new.devices.items():
+        previous = old.devices.get(device_id)
+        if previous is None:
+            changed[device_id] = set(device)
+        elif previous != device:
+            changed[device_id] = device.changed_parameters(previous)
+    for device_id in old.devices.keys() - new.devices.keys():
+        changed[device_id] = set(old.devices[device_id])
+    return changed
+
+
+# The parameters our energy estimates are worked out from
+ENERGY_PARAMETERS = frozenset(("energy_delivered", "voltage", "current"))
+
+
+@dataclass
+class OptimisticValue:
+    """Class to hold a commanded value not yet confirmed by the api."""
+
+    value: Any
+    previous: Any
+    expires: float
+
+
 class ExampleCoordinator(DataUpdateCoordinator):
     """My example coordinator."""
 
-    data: list[dict[str, Any]]
+    data: ExampleAPIData
 
     def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
         """Initialize coordinator."""
@@ -38,6 +128,20 @@ class ExampleCoordinator(DataUpdateCoordinator):
             CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
         )
 
+        # ----------------------------------------------------------------------------
+        # If adaptive polling is enabled, the scan interval is adjusted after every
+        # update.  See polling.py.
+        # ----------------------------------------------------------------------------
+        self.adaptive_polling: AdaptivePolling | None = None
+        if config_entry.options.get(CONF_ADAPTIVE_POLLING, False):
+            self.adaptive_polling = AdaptivePolling(self.poll_interval)
+
+        # ----------------------------------------------------------------------------
+        # Parameters are fetched in tiers, so the ones that rarely change are not
+        # fetched on every update.  See polling.py and const.py.
+        # ----------------------------------------------------------------------------
+        self.tiered_polling = TieredPolling()
+
         # Initialise DataUpdateCoordinator
         super().__init__(
             hass,
@@ -49,10 +153,203 @@ class ExampleCoordinator(DataUpdateCoordinator):
             # platform entities, CoordinatorEntities.
             # Using config option here but you can just use a fixed value.
             update_interval=timedelta(seconds=self.poll_interval),
+            # Only update entities if the data has changed.  When the api tells us
+            # nothing has changed, we return the same data object and HA skips
+            # updating every entity.
+            always_update=False,
         )
 
+        # ----------------------------------------------------------------------------
+        # Statistics of what our refreshes cost, recorded here and by the api.  They
+        # are shown on diagnostic sensors of the hub device.  See stats.py.
+        # ----------------------------------------------------------------------------
+        self.stats = RefreshStats()
+        self._update_entities_started: float | None = None
+        self._update_entities_writes = 0
+
+        # ----------------------------------------------------------------------------
         # Initialise your api here and make available to your integration.
-        self.api = API(host=self.host, user=self.user, pwd=self.pwd, mock=True)
+        # Passing HA's shared aiohttp session lets the api reuse pooled keep-alive
+        # connections and be awaited directly, instead of opening a new connection
+        # in an executor thread for every request.
+        # ----------------------------------------------------------------------------
+        self.api = API(
+            host=self.host,
+            user=self.user,
+            pwd=self.pwd,
+            mock=True,
+            session=async_get_clientsession(hass),
+            stats=self.stats,
+        )
+
+        # ----------------------------------------------------------------------------
+        # Entities send their commands via this queue (see async_set_data below),
+        # so that many commands at once are merged rather than each sending its
+        # own request.
+        # ----------------------------------------------------------------------------
+        self.command_queue = ExampleCommandQueue(
+            hass,
+            config_entry,
+            self.api,
+            window=COMMAND_QUEUE_WINDOW,
+            max_concurrent=MAX_CONCURRENT_COMMANDS,
+        )
+
+        # ----------------------------------------------------------------------------
+        # Commanded values that we show straight away, before the api confirms them.
+        # Keyed by (device_id, parameter).  See async_set_data below.
+        # ----------------------------------------------------------------------------
+        self.optimistic_values: dict[tuple[int, str], OptimisticValue] = {}
+
+        # ----------------------------------------------------------------------------
+        # The parameters that changed in the last update, keyed by device_id, so
+        # only entities whose values changed need to write their state.
+        # None means every entity should update, ie on first load or when the api
+        # becomes available or unavailable.
+        # ----------------------------------------------------------------------------
+        self.changed_parameters: dict[int, set[str]] | None = None
+        self._previous_update_success = True
+        self.entity_writes = 0
+        self.entity_writes_skipped = 0
+
+        # ----------------------------------------------------------------------------
+        # Our listeners indexed by their context, which for our entities is their
+        # device_id, so updating the entities of changed devices does not have to
+        # look at every listener.  See async_add_listener below.
+        # ----------------------------------------------------------------------------
+        self._context_listeners: dict[Any, dict[CALLBACK_TYPE, CALLBACK_TYPE]] = {}
+        self._device_listener_count = 0
+
+        # ----------------------------------------------------------------------------
+        # The last good api data is saved, so on the next start entities can be
+        # created from it without waiting for the api.  See cache.py.
+        # ----------------------------------------------------------------------------
+        self.cache = SnapshotCache(hass, config_entry)
+
+        # ----------------------------------------------------------------------------
+        # Devices are kept as compact records, which share their parameter names and
+        # common values, ie device types, with each other.  See records.py.
+        # ----------------------------------------------------------------------------
+        self.records = DeviceRecords()
+
+        # ----------------------------------------------------------------------------
+        # The entities to create for our devices, keyed by platform, and the data
+        # they were worked out from.  See entity_factory.py.
+        # ----------------------------------------------------------------------------
+        self._entity_descriptions: dict[Platform, list[DeviceParameter]] = {}
+        self._entity_descriptions_data: ExampleAPIData | None = None
+
+        # ----------------------------------------------------------------------------
+        # Only one refresh runs at a time.  See _async_refresh below.
+        # ----------------------------------------------------------------------------
+        self._refresh_task: asyncio.Task | None = None
+        self._refresh_started = 0.0
+        self._follow_up_task: asyncio.Task | None = None
+        self.refreshes = {"started": 0, "joined": 0, "follow_ups": 0}
+
+        # ----------------------------------------------------------------------------
+        # Active off timers are counted down here, rather than by polling the api,
+        # with a tick every second while any are running.  See timers.py.
+        # ----------------------------------------------------------------------------
+        self.off_timers = OffTimerWheel()
+        self._off_timer_tick: asyncio.TimerHandle | None = None
+
+        # ----------------------------------------------------------------------------
+        # Energy is estimated from power between polls, with an update every
+        # ENERGY_UPDATE_INTERVAL seconds while any devices are using power.  See
+        # energy.py.
+        # ----------------------------------------------------------------------------
+        self.energy = EnergyIntegrator()
+        self._energy_tick: asyncio.TimerHandle | None = None
+
+    async def async_load_cache(self) -> bool:
+        """Load the last saved api data into the coordinator.
+
+        Returns False if there is no saved data.
+        """
+        if not (devices := await self.cache.async_load()):
+            return False
+        self.data = ExampleAPIData.from_devices(
+            self.records.record(device) for device in devices
+        )
+        return True
+
+    async def _async_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh data, with only one refresh running at a time.
+
+        The scheduled poll, requested refreshes (ie from services) and the
+        background first refresh all come through here.  Without this, refreshes
+        asked for at the same time would each call the api, one after the other.
+
+        A refresh asked for just after one has started shares that one.  Later,
+        the data it gets may be from before whatever prompted the request, so we
+        wait for it and refresh once more.  However many are asked for while one
+        runs, they all share that one follow up refresh.
+        """
+        if kwargs.get("raise_on_auth_failed") or kwargs.get("raise_on_entry_error"):
+            # The first refresh at setup needs its own errors raised
+            await self._async_measured_refresh(*args, **kwargs)
+            return
+
+        if self._refresh_task is None:
+            self._refresh_started = self.hass.loop.time()
+            self._refresh_task = task = self.hass.async_create_task(
+                self._async_measured_refresh(*args, **kwargs),
+                f"{self.name} refresh",
+                eager_start=True,
+            )
+            self.refreshes["started"] += 1
+            if task.done():
+                self._refresh_task = None
+            else:
+                task.add_done_callback(self._async_refresh_task_done)
+            await asyncio.shield(task)
+            return
+
+        if self.hass.loop.time() - self._refresh_started < REFRESH_JOIN_WINDOW:
+            self.refreshes["joined"] += 1
+            await asyncio.shield(self._refresh_task)
+            return
+
+        if self._follow_up_task is None:
+            self.refreshes["follow_ups"] += 1
+            self._follow_up_task = self.hass.async_create_task(
+                self._async_follow_up_refresh(self._refresh_task, *args, **kwargs),
+                f"{self.name} follow up refresh",
+            )
+        else:
+            self.refreshes["joined"] += 1
+        await asyncio.shield(self._follow_up_task)
+
+    async def _async_measured_refresh(self, *args: Any, **kwargs: Any) -> None:
+        """Refresh data, recording how long updating our entities took.
+
+        The DataUpdateCoordinator updates the entities straight after calling
+        _async_refresh_finished, so the time from there to the end of the refresh
+        is the time taken to update them.
+        """
+        await super()._async_refresh(*args, **kwargs)
+        if self._update_entities_started is not None:
+            self.stats.record_time(UPDATE_ENTITIES_TIME, self._update_entities_started)
+            self.stats.record(
+                ENTITY_WRITES, self.entity_writes - self._update_entities_writes
+            )
+            self._update_entities_started = None
+
+    @callback
+    def _async_refresh_task_done(self, task: asyncio.Task) -> None:
+        """Allow a new refresh once one has finished."""
+        if self._refresh_task is task:
+            self._refresh_task = None
+
+    async def _async_follow_up_refresh(
+        self, refresh_task: asyncio.Task, *args: Any, **kwargs: Any
+    ) -> None:
+        """Refresh again after the running refresh has finished."""
+        await asyncio.wait([refresh_task])
+        # Anything asked for from now on needs another follow up
+        self._follow_up_task = None
+        await self._async_refresh(*args, **kwargs)
 
     async def async_update_data(self):
         """Fetch data from API endpoint.
@@ -65,7 +362,9 @@ class ExampleCoordinator(DataUpdateCoordinator):
             # Get the data from your api
             # NOTE: Change this to use a real api call for data
             # ----------------------------------------------------------------------------
-            data = await self.hass.async_add_executor_job(self.api.get_data)
+            started = time.perf_counter()
+            data = await self.async_get_tiered_data()
+            self.stats.record_time(FETCH_TIME, started)
         except APIConnectionError as err:
             _LOGGER.error(err)
             raise UpdateFailed(err) from err
@@ -73,27 +372,563 @@ class ExampleCoordinator(DataUpdateCoordinator):
             # This will show entities as unavailable by raising UpdateFailed exception
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
+        # ----------------------------------------------------------------------------
+        # If the api says nothing has changed, keep our current data.  There is no
+        # need to decode or index it again and returning the same object means
+        # entities are not updated.
+        # ----------------------------------------------------------------------------
+        if data is None and self.data is not None:
+            if rolled_back := self.reconcile_optimistic_values(self.data):
+                self.async_update_changed(rolled_back)
+            self.adapt_scan_interval(0)
+            self.stats.record(DEVICE_COUNT, len(self.data.devices))
+            return self.data
+
+        # ----------------------------------------------------------------------------
+        # Pre-process the data into lookup tables so entities can quickly find their
+        # device without searching the whole device list.
+        # Then work out what has changed since the last update, so only the entities
+        # affected need to update.
         # What is returned here is stored in self.data by the DataUpdateCoordinator
+        # ----------------------------------------------------------------------------
+        data = ExampleAPIData.from_devices(data or [])
+        # The records are only turned back into dicts when the cache is written
+        self.cache.async_save(list(data.devices.values()))
+
+        # ----------------------------------------------------------------------------
+        # Update every entity on the first live data after starting from the cache,
+        # so they all show they are no longer restored.
+        # ----------------------------------------------------------------------------
+        if self.cache.restored:
+            self.cache.restored = False
+            changed = None
+        else:
+            changed = get_changed_parameters(self.data, data)
+        if changed is not None:
+            for device_id, parameters in self.reconcile_optimistic_values(data).items():
+                changed.setdefault(device_id, set()).update(parameters)
+        else:
+            self.reconcile_optimistic_values(data)
+        self.changed_parameters = changed
+        if changed is not None:
+            self.adapt_scan_interval(len(changed))
+        self.async_sync_off_timers(data, changed)
+        self.async_sync_energy(data, changed)
+        self.stats.record(DEVICE_COUNT, len(data.devices))
         return data
 
+    async def async_get_tiered_data(self) -> list[DeviceRecord] | None:
+        """Fetch the polling tiers that are due and merge them into our current data.
+
+        Returns None if none of them have changed.
+        """
+        now = self.hass.loop.time()
+        tiers = (
+            self.tiered_polling.due_tiers(now)
+            if self.data is not None
+            else list(self.tiered_polling.tiers)
+        )
+
+        # ----------------------------------------------------------------------------
+        # The api passes us each device as soon as it is decoded and we merge its new
+        # values over its current ones straight away, so the whole response is never
+        # held in memory.  See json_stream.py.
+        # We make new device records rather than changing the current ones, as they
+        # are compared to find what has changed.  A device with no new values keeps
+        # its current record.
+        # ----------------------------------------------------------------------------
+        known = self.data.devices if self.data is not None else {}
+        devices = dict(known)
+        reported: dict[PollingTier, set[int]] = {}
+        new_devices = False
+
+        def merge_device(tier: PollingTier) -> Callable[[dict[str, Any]], None]:
+            """Return a function to merge the devices of a tier into our new data."""
+            tier_reported = reported[tier] = set()
+
+            def merge(device: dict[str, Any]) -> None:
+                nonlocal new_devices
+                device_id = device["device_id"]
+                tier_reported.add(device_id)
+                if (current := devices.get(device_id)) is None:
+                    new_devices = True
+                    devices[device_id] = self.records.record(device)
+                else:
+                    devices[device_id] = self.records.merge(current, device)
+
+            return merge
+
+        changed = await self._async_get_tiers(tiers, merge_device)
+
+        # ----------------------------------------------------------------------------
+        # A new device needs all its parameters, so fetch any tiers we skipped.
+        # ----------------------------------------------------------------------------
+        if new_devices and (
+            skipped := [tier for tier in self.tiered_polling.tiers if tier not in tiers]
+        ):
+            tiers += skipped
+            changed += await self._async_get_tiers(skipped, merge_device)
+        self.tiered_polling.fetched(tiers, now)
+
+        if not any(changed):
+            return None
+
+        # ----------------------------------------------------------------------------
+        # A tier polled on every refresh lists every device, so any device missing
+        # from it has been removed.
+        # ----------------------------------------------------------------------------
+        for tier, tier_changed in zip(tiers, changed, strict=True):
+            if tier_changed and tier.interval is None:
+                for device_id in devices.keys() - reported[tier]:
+                    del devices[device_id]
+        return list(devices.values())
+
+    async def _async_get_tiers(
+        self,
+        tiers: list[PollingTier],
+        merge_device: Callable[[PollingTier], Callable[[dict[str, Any]], None]],
+    ) -> list[bool]:
+        """Fetch the parameters of these tiers from the api at the same time.
+
+        Returns whether each tier has changed.
+        """
+        return list(
+            await asyncio.gather(
+                *(
+                    self.api.async_stream_data(tier.parameters, merge_device(tier))
+                    for tier in tiers
+                )
+            )
+        )
+
+    def adapt_scan_interval(self, changes: int) -> None:
+        """Set the next scan interval from the number of devices that changed.
+
+        The DataUpdateCoordinator schedules the next refresh with update_interval
+        after this update finishes, so setting it here takes effect straight away.
+        """
+        if self.adaptive_polling:
+            self.update_interval = timedelta(
+                seconds=self.adaptive_polling.update(changes)
+            )
+
+    @callback
+    def async_adapt_scan_interval_for_command(self) -> None:
+        """Poll sooner to confirm a command we have just sent."""
+        if not self.adaptive_polling:
+            return
+        interval = timedelta(seconds=self.adaptive_polling.activity("command"))
+        if self.update_interval is None or interval < self.update_interval:
+            self.update_interval = interval
+            # Reschedule the pending refresh with the shorter interval
+            self._schedule_refresh()
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        """Update every entity if the api has become available or unavailable.
+
+        Our entities are updated next, so we start timing that here.
+        """
+        self._update_entities_started = time.perf_counter()
+        self._update_entities_writes = self.entity_writes
+        if self.last_update_success != self._previous_update_success:
+            self.changed_parameters = None
+        self._previous_update_success = self.last_update_success
+
+    @callback
+    def async_update_changed(self, changed: dict[int, set[str]]) -> None:
+        """Update the entities of devices whose parameters have changed between refreshes.
+
+        ie our off timer and energy ticks and optimistic values.  Only the listeners
+        of these devices are called, so this costs as much as the number of devices
+        changed, however many entities we have.  The changes of the last refresh
+        are put back afterwards, so they are not mixed up with these.
+        """
+        refresh_changed = self.changed_parameters
+        self.changed_parameters = changed
+        try:
+            self._async_call_listeners(changed)
+        finally:
+            self.changed_parameters = refresh_changed
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> CALLBACK_TYPE:
+        """Listen for data updates, indexed by context."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        listeners = self._context_listeners.setdefault(context, {})
+        listeners[remove_listener] = update_callback
+        if context is not None:
+            self._device_listener_count += 1
+
+        @callback
+        def remove_context_listener() -> None:
+            """Remove update listener."""
+            remove_listener()
+            del listeners[remove_listener]
+            if context is not None:
+                self._device_listener_count -= 1
+            if not listeners and self._context_listeners.get(context) is listeners:
+                del self._context_listeners[context]
+
+        return remove_context_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update listeners of changed devices after a refresh.
+
+        Our entities register with their device_id as their listener context, so
+        entities of devices that have not changed are not called at all, and this
+        only costs as much as the number of devices that changed.
+        """
+        writes = self.entity_writes
+        if self.changed_parameters is None:
+            super().async_update_listeners()
+        else:
+            self._async_call_listeners(self.changed_parameters, include_general=True)
+        # Every entity of a device that did not write its state skipped a write
+        self.entity_writes_skipped += self._device_listener_count - (
+            self.entity_writes - writes
+        )
+
+    @callback
+    def _async_call_listeners(
+        self, device_ids: Iterable[int], include_general: bool = False
+    ) -> None:
+        """Call the listeners of these devices.
+
+        Listeners without a context, ie our hub sensors, are called too if
+        include_general is set.
+        """
+        update_callbacks: list[CALLBACK_TYPE] = []
+        if include_general and (listeners := self._context_listeners.get(None)):
+            update_callbacks.extend(listeners.values())
+        for device_id in device_ids:
+            if listeners := self._context_listeners.get(device_id):
+                update_callbacks.extend(listeners.values())
+        for update_callback in update_callbacks:
+            update_callback()
+
+    def device_changed(self, device_id: int, parameters: Iterable[str]) -> bool:
+        """Return if any of these parameters of a device changed in the last update."""
+        if self.changed_parameters is None:
+            return True
+        if changed := self.changed_parameters.get(device_id):
+            return not changed.isdisjoint(parameters)
+        return False
+
+    def reconcile_optimistic_values(self, data: ExampleAPIData) -> dict[int, set[str]]:
+        """Confirm or roll back optimistic values against new api data.
+
+        A value is confirmed once the api reports it.  If the api reports a
+        different value that was not the one before our command, something else
+        changed the device, so the api wins.  Otherwise we keep showing our value
+        until it times out, to allow for a device that is slow to update.
+
+        Returns the parameters that were rolled back, keyed by device_id.
+        """
+        rolled_back: dict[int, set[str]] = {}
+        now = self.hass.loop.time()
+        for key, optimistic in list(self.optimistic_values.items()):
+            device_id, parameter = key
+            value = data.devices.get(device_id, {}).get(parameter)
+            if value == optimistic.value:
+                _LOGGER.debug("Confirmed %s of device %s", parameter, device_id)
+            elif value == optimistic.previous and now < optimistic.expires:
+                continue
+            else:
+                _LOGGER.debug(
+                    "Rolled back %s of device %s to %s", parameter, device_id, value
+                )
+                rolled_back.setdefault(device_id, set()).add(parameter)
+            del self.optimistic_values[key]
+        return rolled_back
+
+    @callback
+    def async_sync_off_timers(
+        self, data: ExampleAPIData, changed: dict[int, set[str]] | None
+    ) -> None:
+        """Start, move or stop our off timers from new api data.
+
+        Only devices whose state or off timer changed need looking at.  The api
+        gives the minutes left rounded up, so our timer is only moved if it is
+        outside the minute the api says, ie the timer was set from elsewhere.
+        """
+        now = self.hass.loop.time()
+        device_ids = (
+            data.devices
+            if changed is None
+            else [
+                device_id
+                for device_id, parameters in changed.items()
+                if "off_timer" in parameters or "state" in parameters
+            ]
+        )
+        for device_id in device_ids:
+            if (device := data.devices.get(device_id)) is None or (
+                "off_timer" not in device
+            ):
+                self.off_timers.remove(device_id)
+                continue
+            self._async_set_off_timer(
+                device_id, device.get("state"), device["off_timer"], now
+            )
+        self._async_schedule_off_timer_tick()
+
+    @callback
+    def _async_set_off_timer(
+        self, device_id: int, state: Any, off_timer: str, now: float
+    ) -> None:
+        """Set our off timer for a device from its state and off timer values."""
+        seconds = parse_off_timer(off_timer)
+        if state != "ON" or not seconds:
+            self.off_timers.remove(device_id)
+            return
+        remaining = self.off_timers.remaining(device_id, now)
+        if remaining is None or not seconds - 60 < remaining <= seconds:
+            self.off_timers.add(device_id, now + seconds)
+
+    @callback
+    def _async_schedule_off_timer_tick(self) -> None:
+        """Tick on the next whole second, if any off timers are running."""
+        if self._off_timer_tick is not None or not self.off_timers:
+            return
+        self._off_timer_tick = self.hass.loop.call_at(
+            math.floor(self.hass.loop.time()) + 1, self._async_off_timer_tick
+        )
+
+    @callback
+    def _async_off_timer_tick(self) -> None:
+        """Count down our off timers.
+
+        Devices whose timers have run out are shown as off straight away, as if
+        we had turned them off, and a refresh confirms that they are.
+        """
+        self._off_timer_tick = None
+        if expired := self.off_timers.advance(self.hass.loop.time()):
+            for device_id in expired:
+                self.async_set_optimistic_values(
+                    device_id, {"state": "OFF", "off_timer": "00:00"}
+                )
+            self.hass.async_create_task(
+                self.async_request_refresh(), f"{self.name} off timer refresh"
+            )
+        if self.off_timers:
+            self.async_update_changed(
+                {device_id: {"off_timer"} for device_id in self.off_timers.deadlines}
+            )
+        self._async_schedule_off_timer_tick()
+
+    @callback
+    def async_sync_energy(
+        self, data: ExampleAPIData, changed: dict[int, set[str]] | None
+    ) -> None:
+        """Start our energy estimates again from new api data.
+
+        Only devices whose energy or power changed need looking at.
+        """
+        now = self.hass.loop.time()
+        device_ids = (
+            data.devices
+            if changed is None
+            else [
+                device_id
+                for device_id, parameters in changed.items()
+                if not parameters.isdisjoint(ENERGY_PARAMETERS)
+            ]
+        )
+        for device_id in device_ids:
+            if (device := data.devices.get(device_id)) is None or (
+                "energy_delivered" not in device
+            ):
+                self.energy.remove(device_id)
+            else:
+                self.energy.update(device_id, device, now)
+        self._async_schedule_energy_tick()
+
+    @callback
+    def _async_schedule_energy_tick(self) -> None:
+        """Update energy sensors soon, if any devices are using power."""
+        if self._energy_tick is not None or not self.energy.powered_devices():
+            return
+        self._energy_tick = self.hass.loop.call_later(
+            ENERGY_UPDATE_INTERVAL, self._async_energy_tick
+        )
+
+    @callback
+    def _async_energy_tick(self) -> None:
+        """Update the energy sensors of devices using power."""
+        self._energy_tick = None
+        if powered := self.energy.powered_devices():
+            self.async_update_changed(
+                {device_id: {"energy_delivered"} for device_id in powered}
+            )
+        self._async_schedule_energy_tick()
+
+    def get_energy(self, device_id: int) -> float | None:
+        """Get the estimated energy delivered by a device, in Wh."""
+        energy = self.energy.energy(device_id, self.hass.loop.time())
+        if energy is None:
+            return self.get_device_parameter(device_id, "energy_delivered")
+        return round(energy, 3)
+
+    def get_off_timer_remaining(self, device_id: int) -> int:
+        """Get the seconds left on a device's off timer."""
+        remaining = self.off_timers.remaining(device_id, self.hass.loop.time())
+        if remaining is None:
+            return parse_off_timer(self.get_device_parameter(device_id, "off_timer"))
+        return remaining
+
+    async def async_shutdown(self) -> None:
+        """Run shutdown clean up."""
+        await super().async_shutdown()
+        self.command_queue.async_shutdown()
+        if self._off_timer_tick is not None:
+            self._off_timer_tick.cancel()
+            self._off_timer_tick = None
+        if self._energy_tick is not None:
+            self._energy_tick.cancel()
+            self._energy_tick = None
+
     # ----------------------------------------------------------------------------
     # Here we add some custom functions on our data coordinator to be called
     # from entity platforms to get access to the specific data they want.
     #
     # These will be specific to your api or yo may not need them at all
     # ----------------------------------------------------------------------------
-    def get_device(self, device_id: int) -> dict[str, Any]:
+    async def async_set_data(
+        self,
+        device_id: int,
+        parameter: str,
+        value: Any,
+        expected: dict[str, Any] | None = None,
+    ) -> bool:
+        """Send a parameter change for a device to the api via the command queue.
+
+        The new value is shown on entities straight away, without waiting for the
+        api or a refresh.  Pass expected if the command changes other parameters
+        too, ie setting brightness turns a light on.
+        """
+        return await self.async_set_parameters(device_id, {parameter: value}, expected)
+
+    async def async_set_parameters(
+        self,
+        device_id: int,
+        values: dict[str, Any],
+        expected: dict[str, Any] | None = None,
+    ) -> bool:
+        """Send changes to many parameters of a device to the api in one request.
+
+        Use this when an action changes more than one parameter, ie turning a fan
+        on at a speed, so it is one round trip and the device cannot end up with
+        only some of them changed.  The values are sent, and set on the device,
+        in the order given.
+        """
+        optimistic = self.async_set_optimistic_values(device_id, expected or values)
+        self.async_adapt_scan_interval_for_command()
+        try:
+            result = await self.command_queue.async_set_parameters(device_id, values)
+        except Exception:
+            self.async_rollback_optimistic_values(device_id, optimistic)
+            raise
+        if not result:
+            self.async_rollback_optimistic_values(device_id, optimistic)
+            return result
+        # Fetch the new values on the next refresh, even if their tier is not due,
+        # or they would be rolled back when they time out.
+        self.tiered_polling.mark_due(values)
+        if "off_timer" in values or "state" in values:
+            self._async_set_off_timer(
+                device_id,
+                values.get("state", self.get_device_parameter(device_id, "state")),
+                values.get(
+                    "off_timer", self.get_device_parameter(device_id, "off_timer")
+                ),
+                self.hass.loop.time(),
+            )
+            self._async_schedule_off_timer_tick()
+        return result
+
+    @callback
+    def async_set_optimistic_values(
+        self, device_id: int, values: dict[str, Any]
+    ) -> dict[str, OptimisticValue]:
+        """Show commanded values on entities before the api confirms them."""
+        expires = self.hass.loop.time() + OPTIMISTIC_TIMEOUT
+        optimistic = {}
+        for parameter, value in values.items():
+            previous = self.get_device_parameter(device_id, parameter)
+            if previous is None:
+                # Not a parameter this device has
+                continue
+            if current := self.optimistic_values.get((device_id, parameter)):
+                # A newer command replaces an unconfirmed one, but we keep the
+                # value from before either of them was sent.
+                previous = current.previous
+            optimistic[parameter] = self.optimistic_values[(device_id, parameter)] = (
+                OptimisticValue(value, previous, expires)
+            )
+        if optimistic:
+            self.async_update_changed({device_id: set(optimistic)})
+        return optimistic
+
+    @callback
+    def async_rollback_optimistic_values(
+        self, device_id: int, optimistic: dict[str, OptimisticValue]
+    ) -> None:
+        """Remove optimistic values for a command that failed.
+
+        If a newer command has since replaced a value, that one is left alone.
+        """
+        rolled_back = set()
+        for parameter, value in optimistic.items():
+            if self.optimistic_values.get((device_id, parameter)) is value:
+                del self.optimistic_values[(device_id, parameter)]
+                rolled_back.add(parameter)
+        if rolled_back:
+            self.async_update_changed({device_id: rolled_back})
+
+    def get_entity_descriptions(self, platform: Platform) -> list[DeviceParameter]:
+        """Get the entities a platform should create for our current data.
+
+        The devices are only sorted into platforms once for each update, however
+        many platforms ask.
+        """
+        if self._entity_descriptions_data is not self.data:
+            self._entity_descriptions = classify_devices(
+                self.data.devices.values() if self.data else ()
+            )
+            self._entity_descriptions_data = self.data
+        return self._entity_descriptions.get(platform, [])
+
+    def get_device(self, device_id: int) -> DeviceRecord | None:
         """Get a device entity from our api data."""
         try:
-            return [
-                devices for devices in self.data if devices["device_id"] == device_id
-            ][0]
-        except (TypeError, IndexError):
-            # In this case if the device id does not exist you will get an IndexError.
-            # If api did not return any data, you will get TypeError.
+            return self.data.devices.get(device_id)
+        except AttributeError:
+            # If api did not return any data, self.data will be None.
+            return None
+
+    def get_device_by_uid(self, device_uid: str) -> DeviceRecord | None:
+        """Get a device entity from our api data by its device uid."""
+        try:
+            return self.data.device_uids.get(device_uid)
+        except AttributeError:
             return None
 
+    def get_devices_by_type(self, device_type: str) -> list[DeviceRecord]:
+        """Get all devices of a device type from our api data."""
+        try:
+            return self.data.device_types.get(device_type, [])
+        except AttributeError:
+            return []
+
     def get_device_parameter(self, device_id: int, parameter: str) -> Any:
         """Get the parameter value of one of our devices from our api data."""
+        if self.optimistic_values and (
+            optimistic := self.optimistic_values.get((device_id, parameter))
+        ):
+            return optimistic.value
         if device := self.get_device(device_id):
             return device.get(parameter)
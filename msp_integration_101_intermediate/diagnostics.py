@@ -0,0 +1,66 @@
+"""Diagnostics support for our integration.
+
+This adds a Download Diagnostics option to the integration, which gives a json
+file of whatever is returned here.  It is very useful for users to attach to
+issues.
+
+Make sure you redact anything sensitive, like passwords.
+
+https://developers.home-assistant.io/docs/core/integration_diagnostics
+"""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from . import MyConfigEntry
+from .coordinator import ExampleCoordinator
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: MyConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: ExampleCoordinator = config_entry.runtime_data.coordinator
+
+    return {
+        "entry": {
+            "data": async_redact_data(config_entry.data, TO_REDACT),
+            "options": dict(config_entry.options),
+        },
+        "polling": {
+            "adaptive": coordinator.adaptive_polling is not None,
+            "configured_interval": coordinator.poll_interval,
+            "effective_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "last_update_success": coordinator.last_update_success,
+            "adaptive_polling": coordinator.adaptive_polling.as_dict()
+            if coordinator.adaptive_polling
+            else None,
+            "tiers": coordinator.tiered_polling.as_dict(hass.loop.time()),
+            "refreshes": coordinator.refreshes,
+        },
+        "api": {
+            "connect_timeout": coordinator.api.connect_timeout,
+            "read_timeout": coordinator.api.read_timeout,
+            "retries": coordinator.api.retries,
+            "circuit_breaker": coordinator.api.circuit_breaker.as_dict(),
+        },
+        "cache": coordinator.cache.as_dict(),
+        "records": coordinator.records.as_dict(),
+        "energy": coordinator.energy.as_dict(hass.loop.time()),
+        "off_timers": {
+            "active": coordinator.off_timers.as_dict(hass.loop.time()),
+            "expired": coordinator.off_timers.expired,
+        },
+        "statistics": coordinator.stats.as_dict(),
+        "entities": {
+            "writes": coordinator.entity_writes,
+            "writes_skipped": coordinator.entity_writes_skipped,
+        },
+    }
@@ -0,0 +1,107 @@
+"""Energy estimates for our integration.
+
+Our sockets report the energy they have delivered, but we only see it when we
+poll, so an energy sensor steps up once per poll.  To get a smooth reading you
+would have to poll very often.
+
+Instead, between polls, the coordinator works out the energy used from the
+power (voltage x current) the socket last reported and the time since.  When a
+poll brings a new energy value from the device, the estimate starts again from
+that, so it cannot drift far from the real value.
+
+Energy sensors are total increasing, so HA treats any drop as the meter being
+reset.  If we have estimated ahead of the device, we hold our value until the
+device catches up, rather than showing it going down.
+"""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(slots=True)
+class EnergyEstimate:
+    """Class to hold the energy estimate of a device."""
+
+    # The last energy the device reported, in Wh
+    reported: float
+    # The energy in Wh and the power in W our estimate starts from
+    energy: float
+    power: float
+    anchored_at: float
+    # The highest energy we have shown, so it never goes down
+    shown: float
+
+    def estimate(self, now: float) -> float:
+        """Return the estimated energy at now, in Wh."""
+        return self.energy + self.power * max(now - self.anchored_at, 0) / 3600
+
+
+class EnergyIntegrator:
+    """Estimate the energy delivered by devices between polls.
+
+    Times are in seconds from the event loop clock.
+    """
+
+    def __init__(self) -> None:
+        """Initialise."""
+        self.estimates: dict[int, EnergyEstimate] = {}
+        self.anchors = 0
+
+    def update(self, device_id: int, device: Mapping[str, Any], now: float) -> None:
+        """Start the estimate of a device again from its latest api values."""
+        try:
+            energy = float(device["energy_delivered"])
+            power = float(device.get("voltage") or 0) * float(
+                device.get("current") or 0
+            )
+        except (KeyError, TypeError, ValueError):
+            self.estimates.pop(device_id, None)
+            return
+        self.anchors += 1
+        if (estimate := self.estimates.get(device_id)) is None:
+            self.estimates[device_id] = EnergyEstimate(
+                energy, energy, power, now, energy
+            )
+            return
+        if energy == estimate.reported:
+            # The device has not reported new energy, so carry on from our estimate
+            estimate.energy = estimate.estimate(now)
+        else:
+            estimate.reported = estimate.energy = energy
+        estimate.power = power
+        estimate.anchored_at = now
+
+    def remove(self, device_id: int) -> None:
+        """Stop estimating the energy of a device."""
+        self.estimates.pop(device_id, None)
+
+    def energy(self, device_id: int, now: float) -> float | None:
+        """Return the estimated energy of a device in Wh, or None if we have none."""
+        if (estimate := self.estimates.get(device_id)) is None:
+            return None
+        estimate.shown = max(estimate.shown, estimate.estimate(now))
+        return estimate.shown
+
+    def powered_devices(self) -> list[int]:
+        """Return the devices using power, whose estimates are going up."""
+        return [
+            device_id
+            for device_id, estimate in self.estimates.items()
+            if estimate.power > 0
+        ]
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return the estimates, for diagnostics."""
+        return {
+            "anchors": self.anchors,
+            "devices": {
+                str(device_id): {
+                    "reported_energy": estimate.reported,
+                    "power": estimate.power,
+                    "seconds_since_anchor": now - estimate.anchored_at,
+                    "estimated_energy": estimate.estimate(now),
+                }
+                for device_id, estimate in self.estimates.items()
+            },
+        }
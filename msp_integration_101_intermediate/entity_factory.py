@@ -0,0 +1,70 @@
+"""Work out which entities to create for our devices.
+
+Rather than each entity platform searching all the devices for the ones it
+wants, every device is looked at once, using the tables below, and sorted into
+the entities each platform needs to create.  This keeps setup time in step with
+the number of devices, however many entity types you add.
+
+To add an entity type, add it to the tables here and its class to the platform.
+"""
+
+from collections.abc import Iterable, Mapping
+from typing import Any, NamedTuple
+
+from homeassistant.const import Platform
+
+# ----------------------------------------------------------------------------
+# The entities created for every device of a device type, as (platform, parameter)
+# ----------------------------------------------------------------------------
+DEVICE_TYPE_ENTITIES: dict[str, tuple[tuple[Platform, str], ...]] = {
+    "CONTACT_SENSOR": ((Platform.BINARY_SENSOR, "state"),),
+    "DIMMABLE_LIGHT": ((Platform.LIGHT, "state"),),
+    "FAN": ((Platform.FAN, "state"),),
+    "ON_OFF_LIGHT": ((Platform.LIGHT, "state"),),
+    "SOCKET": ((Platform.SWITCH, "state"),),
+}
+
+# ----------------------------------------------------------------------------
+# The parameters that have a sensor on any device with a value for them
+# ----------------------------------------------------------------------------
+SENSOR_PARAMETERS = (
+    "current",
+    "energy_delivered",
+    "off_timer",
+    "temperature",
+    "voltage",
+)
+
+
+class DeviceParameter(NamedTuple):
+    """Class to hold a device parameter to create an entity for.
+
+    A NamedTuple rather than a dataclass, as one is made for every entity and
+    they are much quicker to create.
+    """
+
+    device: Mapping[str, Any]
+    parameter: str
+
+
+def classify_devices(
+    devices: Iterable[Mapping[str, Any]],
+) -> dict[Platform, list[DeviceParameter]]:
+    """Return the entities to create for these devices, keyed by platform."""
+    entities: dict[Platform, list[DeviceParameter]] = {
+        platform: []
+        for type_entities in DEVICE_TYPE_ENTITIES.values()
+        for platform, _ in type_entities
+    }
+    sensors = entities[Platform.SENSOR] = []
+    for device in devices:
+        for platform, parameter in DEVICE_TYPE_ENTITIES.get(
+            device.get("device_type"), ()
+        ):
+            entities[platform].append(DeviceParameter(device, parameter))
+        sensors.extend(
+            DeviceParameter(device, parameter)
+            for parameter in SENSOR_PARAMETERS
+            if device.get(parameter)
+        )
+    return entities
@@ -1,9 +1,11 @@
 """Fan setup for our Integration."""
 
 import logging
+import math
 from typing import Any
 
 from homeassistant.components.fan import FanEntity, FanEntityFeature
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.util.percentage import percentage_to_ranged_value
@@ -26,13 +28,13 @@ async def async_setup_entry(
 
     # ----------------------------------------------------------------------------
     # Here we are going to add our fan entity for the fan in our mock data.
+    # See entity_factory.py for which devices have fans.
     # ----------------------------------------------------------------------------
 
     # Fans
     fans = [
-        ExampleFan(coordinator, device, "state")
-        for device in coordinator.data
-        if device.get("device_type") == "FAN"
+        ExampleFan(coordinator, entity.device, entity.parameter)
+        for entity in coordinator.get_entity_descriptions(Platform.FAN)
     ]
 
     # Create the fans.
@@ -49,10 +51,18 @@ class ExampleFan(ExampleBaseEntity, FanEntity):
     """
 
     _attr_speed_count = 3
-    _attr_supported_features = FanEntityFeature.OSCILLATE | FanEntityFeature.SET_SPEED
+    _attr_supported_features = (
+        FanEntityFeature.OSCILLATE
+        | FanEntityFeature.SET_SPEED
+        | FanEntityFeature.TURN_ON
+        | FanEntityFeature.TURN_OFF
+    )
+    # Our features include TURN_ON and TURN_OFF, so HA does not need to guess
+    _enable_turn_on_off_backwards_compatibility = False
 
     _speed_parameter = "speed"
     _oscillating_parameter = "oscillating"
+    _watched_parameters = (_speed_parameter, _oscillating_parameter)
 
     @property
     def is_on(self) -> bool | None:
@@ -93,28 +103,22 @@ class ExampleFan(ExampleBaseEntity, FanEntity):
 
         A turn on command can be sent with or without a %, so we
         need to check that and turn on and set speed if requested.
+        These are sent together in one request, so the fan cannot end up on at
+        the wrong speed.
         """
-
-        await self.hass.async_add_executor_job(
-            self.coordinator.api.set_data, self.device_id, self.parameter, "ON"
-        )
-
+        values = {self.parameter: "ON"}
         if percentage:
-            self.async_set_fan_speed(percentage)
+            values[self._speed_parameter] = self.percentage_to_speed(percentage)
+        await self.coordinator.async_set_parameters(self.device_id, values)
         # ----------------------------------------------------------------------------
-        # Use async_refresh on the DataUpdateCoordinator to perform immediate update.
-        # Using self.async_update or self.coordinator.async_request_refresh may delay update due
-        # to trying to batch requests.
+        # The coordinator shows the new state on the entity straight away and the
+        # next refresh confirms it, so there is no need to force a refresh here.
         # ----------------------------------------------------------------------------
-        await self.coordinator.async_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the fan off."""
 
-        await self.hass.async_add_executor_job(
-            self.coordinator.api.set_data, self.device_id, self.parameter, "OFF"
-        )
-        await self.coordinator.async_refresh()
+        await self.coordinator.async_set_data(self.device_id, self.parameter, "OFF")
 
     async def async_set_percentage(self, percentage: int) -> None:
         """Set the speed of the fan, as a percentage.
@@ -130,18 +134,13 @@ class ExampleFan(ExampleBaseEntity, FanEntity):
             await self.async_turn_on(percentage)
         else:
             await self.async_set_fan_speed(percentage)
-            await self.coordinator.async_refresh()
 
     async def async_oscillate(self, oscillating: bool) -> None:
         """Oscillate the fan."""
 
-        await self.hass.async_add_executor_job(
-            self.coordinator.api.set_data,
-            self.device_id,
-            self._oscillating_parameter,
-            "ON" if oscillating else "OFF",
+        await self.coordinator.async_set_data(
+            self.device_id, self._oscillating_parameter, "ON" if oscillating else "OFF"
         )
-        await self.coordinator.async_refresh()
 
     # ----------------------------------------------------------------------------
     # Added a custom method to make our code simpler
@@ -149,9 +148,12 @@ class ExampleFan(ExampleBaseEntity, FanEntity):
 
     async def async_set_fan_speed(self, percentage: int) -> None:
         """Set fan speed."""
-        await self.hass.async_add_executor_job(
-            self.coordinator.api.set_data,
+        await self.coordinator.async_set_data(
             self.device_id,
             self._speed_parameter,
-            percentage_to_ranged_value(1, self.speed_count, percentage),
+            self.percentage_to_speed(percentage),
         )
+
+    def percentage_to_speed(self, percentage: int) -> int:
+        """Convert a percentage to our fan speeds 1..speed_count."""
+        return math.ceil(percentage_to_ranged_value((1, self.speed_count), percentage))
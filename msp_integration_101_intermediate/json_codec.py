@@ -0,0 +1,45 @@
+"""JSON encoding and decoding for our api.
+
+The standard library json module is written partly in python and decodes from
+text, so bytes from the api have to be decoded to text first.  orjson is written
+in rust, decodes straight from bytes and is several times quicker.
+
+orjson is used if it is installed, which it always is with HA as HA uses it
+too, otherwise we fall back to the standard library.  Your api library should do
+the same, rather than require it, so it still works elsewhere.
+
+https://github.com/ijl/orjson
+"""
+
+from collections.abc import Callable
+import json
+from typing import Any, NamedTuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONCodec(NamedTuple):
+    """Class to hold functions to encode and decode json.
+
+    loads takes bytes or text and its errors are json.JSONDecodeError (orjson's
+    errors subclass it).  dumps returns compact utf-8 bytes.
+    """
+
+    name: str
+    loads: Callable[[bytes | str], Any]
+    dumps: Callable[[Any], bytes]
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    """Encode json with the standard library, as compact as orjson's."""
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+STDLIB_CODEC = JSONCodec("json", json.loads, _stdlib_dumps)
+ORJSON_CODEC = JSONCodec("orjson", orjson.loads, orjson.dumps) if orjson else None
+
+# The fastest codec we have
+DEFAULT_CODEC = ORJSON_CODEC or STDLIB_CODEC
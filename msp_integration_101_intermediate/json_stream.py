@@ -0,0 +1,123 @@
+"""Decode a JSON array as it arrives.
+
+Decoding a whole response with json.loads means holding the raw bytes, the
+decoded text and every decoded object in memory at the same time.  For a hub
+with tens of thousands of devices that is a lot of memory, just to turn it into
+the device dicts we actually keep.
+
+JSONArrayStreamDecoder is fed the response a chunk at a time, as it is
+downloaded, and returns each item of the array as soon as all of it has
+arrived.  Only the part of the response not decoded yet is kept, so the memory
+used while decoding depends on the chunk size, not the size of the response.
+
+The complete items in each chunk are decoded together, with one call to loads,
+which is much quicker than one call per item and, like decoding the whole
+response, uses one string for every copy of the same dict key rather than a new
+one for each item.  Pass a faster loads, ie orjson's (see json_codec.py), to
+decode them with that.  An item that cannot be found this way, ie because it
+has a '}' in a string, is decoded on its own by the standard library decoder.
+"""
+
+import codecs
+from collections.abc import Callable
+import json
+from typing import Any
+
+_WHITESPACE = " \t\n\r"
+
+
+class JSONArrayStreamDecoder:
+    """Decode the items of a JSON array from chunks of its bytes."""
+
+    def __init__(self, loads: Callable[[str], Any] = json.loads) -> None:
+        """Initialise."""
+        self._loads = loads
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json_decoder = json.JSONDecoder()
+        # The text received but not decoded yet
+        self._buffer = ""
+        self._started = False
+        self._expect_item = True
+        self.finished = False
+        self.items = 0
+
+    def feed(self, chunk: bytes, final: bool = False) -> list[Any]:
+        """Add the next chunk of the response and return the items it completed.
+
+        Pass final=True with the last chunk (which can be empty).
+        """
+        self._buffer += self._text_decoder.decode(chunk, final)
+        items = []
+        buffer = self._buffer
+        position = 0
+        length = len(buffer)
+        while True:
+            while position < length and buffer[position] in _WHITESPACE:
+                position += 1
+            if position == length or self.finished:
+                break
+            character = buffer[position]
+            if not self._started:
+                if character != "[":
+                    raise ValueError(f"Expected a JSON array, got {character!r}")
+                self._started = True
+                position += 1
+            elif character == "]":
+                if self._expect_item and self.items:
+                    raise ValueError("Expected an item after ','")
+                self.finished = True
+                position += 1
+            elif character == "," and not self._expect_item:
+                self._expect_item = True
+                position += 1
+            elif self._expect_item:
+                if batch := self._decode_batch(buffer, position):
+                    batch_items, position = batch
+                    items.extend(batch_items)
+                    self.items += len(batch_items)
+                    self._expect_item = False
+                    continue
+                try:
+                    item, end = self._json_decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    # The rest of this item has not arrived yet
+                    break
+                if not final:
+                    # A number is decoded up to the end of what has arrived, ie
+                    # "-2500." as -2500, so only take an item once we have seen
+                    # what follows it
+                    following = end
+                    while following < length and buffer[following] in _WHITESPACE:
+                        following += 1
+                    if following == length or buffer[following] not in ",]":
+                        break
+                items.append(item)
+                self.items += 1
+                self._expect_item = False
+                position = end
+            else:
+                raise ValueError(f"Expected ',' or ']', got {character!r}")
+        self._buffer = buffer[position:]
+        if final and not self.finished:
+            raise ValueError("Incomplete JSON array")
+        if self.finished and self._buffer.strip(_WHITESPACE):
+            raise ValueError("Extra data after JSON array")
+        return items
+
+    def _decode_batch(self, buffer: str, position: int) -> tuple[list[Any], int] | None:
+        """Decode the items from position up to the last '}' in the buffer.
+
+        Returns the items and the position after them, or None if that is not
+        the end of an item, ie the '}' is in a string or closes a nested object
+        of an item that has not all arrived, in which case the items are decoded
+        one at a time.
+        """
+        end = buffer.rfind("}", position) + 1
+        if not end:
+            return None
+        try:
+            return self._loads(f"[{buffer[position:end]}]"), end
+        except json.JSONDecodeError:
+            return None
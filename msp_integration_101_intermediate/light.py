@@ -7,6 +7,7 @@ from typing import Any
 import voluptuous as vol
 
 from homeassistant.components.light import ATTR_BRIGHTNESS, ColorMode, LightEntity
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv, entity_platform
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -32,26 +33,18 @@ async def async_setup_entry(
     # Here we are going to add some lights entities for the lights in our mock data.
     # We have an on/off light and a dimmable light in our mock data, so add each
     # specific class based on the light type.
+    # See entity_factory.py for which devices have lights.
     # ----------------------------------------------------------------------------
-    lights = []
-
-    # On/Off lights
-    lights.extend(
-        [
-            ExampleOnOffLight(coordinator, device, "state")
-            for device in coordinator.data
-            if device.get("device_type") == "ON_OFF_LIGHT"
-        ]
-    )
-
-    # Dimmable lights
-    lights.extend(
-        [
-            ExampleDimmableLight(coordinator, device, "state")
-            for device in coordinator.data
-            if device.get("device_type") == "DIMMABLE_LIGHT"
-        ]
-    )
+    light_classes = {
+        "ON_OFF_LIGHT": ExampleOnOffLight,
+        "DIMMABLE_LIGHT": ExampleDimmableLight,
+    }
+    lights = [
+        light_classes[entity.device["device_type"]](
+            coordinator, entity.device, entity.parameter
+        )
+        for entity in coordinator.get_entity_descriptions(Platform.LIGHT)
+    ]
 
     # Create the lights.
     async_add_entities(lights)
@@ -105,27 +98,19 @@ class ExampleOnOffLight(ExampleBaseEntity, LightEntity):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
-        await self.hass.async_add_executor_job(
-            self.coordinator.api.set_data, self.device_id, self.parameter, "ON"
-        )
+        await self.coordinator.async_set_data(self.device_id, self.parameter, "ON")
         # ----------------------------------------------------------------------------
-        # Use async_refresh on the DataUpdateCoordinator to perform immediate update.
-        # Using self.async_update or self.coordinator.async_request_refresh may delay update due
-        # to trying to batch requests.
+        # The coordinator shows the new state on the entity straight away and the
+        # next refresh confirms it, so there is no need to force a refresh here.
         # ----------------------------------------------------------------------------
-        await self.coordinator.async_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
-        await self.hass.async_add_executor_job(
-            self.coordinator.api.set_data, self.device_id, self.parameter, "OFF"
-        )
+        await self.coordinator.async_set_data(self.device_id, self.parameter, "OFF")
         # ----------------------------------------------------------------------------
-        # Use async_refresh on the DataUpdateCoordinator to perform immediate update.
-        # Using self.async_update or self.coordinator.async_request_refresh may delay update due
-        # to trying to batch requests.
+        # The coordinator shows the new state on the entity straight away and the
+        # next refresh confirms it, so there is no need to force a refresh here.
         # ----------------------------------------------------------------------------
-        await self.coordinator.async_refresh()
 
     async def async_set_off_timer(self, off_time: timedelta) -> None:
         """Handle the set off timer service call.
@@ -133,16 +118,11 @@ class ExampleOnOffLight(ExampleBaseEntity, LightEntity):
         Important here to have your service parameters included in your
         function as they are passed as named parameters.
         """
-        await self.hass.async_add_executor_job(
-            self.coordinator.api.set_data,
-            self.device_id,
-            "off_timer",
-            ":".join(str(off_time).split(":")[:2]),
+        await self.coordinator.async_set_data(
+            self.device_id, "off_timer", ":".join(str(off_time).split(":")[:2])
         )
-        # We have made a change to our device, so call a refresh to get updated data.
-        # We use async_request_refresh here to batch the updates in case you select
-        # multiple entities.
-        await self.coordinator.async_request_refresh()
+        # The coordinator counts the off timer down from here, updating the off timer
+        # sensor every second, so no refresh needed.
 
 
 class ExampleDimmableLight(ExampleOnOffLight):
@@ -150,6 +130,7 @@ class ExampleDimmableLight(ExampleOnOffLight):
 
     _attr_supported_color_modes = {ColorMode.BRIGHTNESS}
     _attr_color_mode = ColorMode.BRIGHTNESS
+    _watched_parameters = ("brightness",)
 
     @property
     def brightness(self) -> int:
@@ -164,16 +145,18 @@ class ExampleDimmableLight(ExampleOnOffLight):
         """Turn the entity on."""
         if ATTR_BRIGHTNESS in kwargs:
             brightness = int(kwargs[ATTR_BRIGHTNESS] * (100 / 255))
-            await self.hass.async_add_executor_job(
-                self.coordinator.api.set_data, self.device_id, "brightness", brightness
+            # Send the state and brightness together, so they are set in one
+            # request.  State first, as our light turns on at full brightness.
+            await self.coordinator.async_set_parameters(
+                self.device_id,
+                {
+                    self.parameter: "ON" if brightness > 0 else "OFF",
+                    "brightness": brightness,
+                },
             )
         else:
-            await self.hass.async_add_executor_job(
-                self.coordinator.api.set_data, self.device_id, self.parameter, "ON"
-            )
+            await self.coordinator.async_set_data(self.device_id, self.parameter, "ON")
         # ----------------------------------------------------------------------------
-        # Use async_refresh on the DataUpdateCoordinator to perform immediate update.
-        # Using self.async_update or self.coordinator.async_request_refresh may delay update due
-        # to trying to batch requests and cause wierd UI behaviour.
+        # The coordinator shows the new state on the entity straight away and the
+        # next refresh confirms it, so there is no need to force a refresh here.
         # ----------------------------------------------------------------------------
-        await self.coordinator.async_refresh()
@@ -0,0 +1,179 @@
+"""Adaptive polling for our integration.
+
+Polling at a fixed interval is a trade off.  Poll too often and you load the
+device and HA for no reason when nothing is happening.  Poll too slowly and
+changes take a long time to show.
+
+AdaptivePolling works out the next scan interval from what the last update found.
+While devices are changing (or just after we have sent a command) it polls more
+often, down to the minimum scan interval, and when nothing changes it backs off
+exponentially up to a maximum.
+
+TieredPolling splits the device parameters into tiers that are each polled at
+their own rate, so parameters that rarely change are not fetched every time.
+"""
+
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ADAPTIVE_BACKOFF_FACTOR,
+    ADAPTIVE_HISTORY_SIZE,
+    FAST_TIER_PARAMETERS,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    SLOW_TIER_INTERVAL,
+    SLOW_TIER_PARAMETERS,
+)
+
+
+@dataclass
+class PollingDecision:
+    """Class to hold a scan interval decision."""
+
+    time: str
+    reason: str
+    changes: int
+    interval: float
+
+
+class AdaptivePolling:
+    """Work out the scan interval from the rate of change of our devices."""
+
+    def __init__(
+        self,
+        scan_interval: float,
+        minimum: float = MIN_SCAN_INTERVAL,
+        maximum: float = MAX_SCAN_INTERVAL,
+        factor: float = ADAPTIVE_BACKOFF_FACTOR,
+    ) -> None:
+        """Initialise."""
+        # The configured scan interval can never take us below the minimum
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, scan_interval, self.minimum)
+        self.factor = factor
+        self.interval = float(max(scan_interval, self.minimum))
+        self.history: deque[PollingDecision] = deque(maxlen=ADAPTIVE_HISTORY_SIZE)
+
+    def update(self, changes: int) -> float:
+        """Return the next scan interval after an update with this many changes."""
+        if changes:
+            self._set_interval(self.interval / self.factor, "changed", changes)
+        else:
+            self._set_interval(self.interval * self.factor, "unchanged", changes)
+        return self.interval
+
+    def activity(self, reason: str) -> float:
+        """Return the next scan interval after we have changed a device.
+
+        A command means we expect the device to change, so poll at the minimum
+        interval to confirm it as soon as we can.
+        """
+        self._set_interval(self.minimum, reason, 1)
+        return self.interval
+
+    def _set_interval(self, interval: float, reason: str, changes: int) -> None:
+        """Set the interval, keeping it between the minimum and maximum."""
+        self.interval = float(min(max(interval, self.minimum), self.maximum))
+        self.history.append(
+            PollingDecision(
+                dt_util.utcnow().isoformat(), reason, changes, self.interval
+            )
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the scheduler state for diagnostics."""
+        return {
+            "effective_interval": self.interval,
+            "minimum_interval": self.minimum,
+            "maximum_interval": self.maximum,
+            "backoff_factor": self.factor,
+            "history": [asdict(decision) for decision in self.history],
+        }
+
+
+@dataclass(frozen=True)
+class PollingTier:
+    """Class to hold a group of parameters polled at the same rate.
+
+    An interval of None means the tier is polled on every refresh.
+    """
+
+    name: str
+    parameters: tuple[str, ...]
+    interval: float | None = None
+
+
+POLLING_TIERS = (
+    PollingTier("fast", FAST_TIER_PARAMETERS),
+    PollingTier("slow", SLOW_TIER_PARAMETERS, SLOW_TIER_INTERVAL),
+)
+
+
+class TieredPolling:
+    """Track which polling tiers are due to be fetched."""
+
+    def __init__(self, tiers: tuple[PollingTier, ...] = POLLING_TIERS) -> None:
+        """Initialise."""
+        self.tiers = tiers
+        self.next_due: dict[str, float] = {}
+        # Tiers with parameters we have changed since they were last fetched
+        self.changed: set[str] = set()
+
+    def due_tiers(self, now: float) -> list[PollingTier]:
+        """Return the tiers that are due to be fetched."""
+        tiers = [
+            tier
+            for tier in self.tiers
+            if tier.interval is None
+            or tier.name in self.changed
+            or now >= self.next_due.get(tier.name, now)
+        ]
+        self.changed.difference_update(tier.name for tier in tiers)
+        return tiers
+
+    def fetched(self, tiers: list[PollingTier], now: float) -> None:
+        """Record that these tiers have been fetched.
+
+        A tier changed while it was being fetched may have been fetched before
+        the change, so it stays due.
+        """
+        for tier in tiers:
+            if tier.interval is not None and tier.name not in self.changed:
+                self.next_due[tier.name] = now + tier.interval
+
+    def mark_due(self, parameters: Iterable[str]) -> None:
+        """Fetch the tiers of these parameters on the next refresh.
+
+        Call this when we change parameters on the api, so the refresh after
+        the change gets their new values rather than waiting for their tier.
+        """
+        parameters = set(parameters)
+        self.changed.update(
+            tier.name
+            for tier in self.tiers
+            if tier.interval is not None and not parameters.isdisjoint(tier.parameters)
+        )
+
+    def due_in(self, tier: PollingTier, now: float) -> float | None:
+        """Return the seconds until a tier is due, or None if it is not scheduled."""
+        if tier.name in self.changed:
+            return 0
+        if (next_due := self.next_due.get(tier.name)) is None:
+            return None
+        return max(next_due - now, 0)
+
+    def as_dict(self, now: float) -> dict[str, Any]:
+        """Return the tier state for diagnostics."""
+        return {
+            tier.name: {
+                "interval": tier.interval,
+                "parameters": list(tier.parameters),
+                "due_in": self.due_in(tier, now),
+            }
+            for tier in self.tiers
+        }
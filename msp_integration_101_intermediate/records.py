@@ -0,0 +1,168 @@
+"""Compact records of our devices.
+
+The api gives us each device as a dict.  A dict is quick, but big, as each one
+has its own hash table of its keys, and every string value in it is a separate
+string, even when thousands of devices have the same device type or software
+version.  With 100k devices that is a lot of memory for the same few values.
+
+A DeviceRecord keeps just a tuple of a device's values.  The parameter names
+and where each one is in the tuple are kept once, in a RecordLayout, shared by
+every device with the same parameters.  Values of parameters that only have a
+few different values, ie device_type, are interned, so every device shares one
+string for each value.
+
+DeviceRecords are read only mappings, so the rest of the integration can use
+them like the device dicts they replace.  A new record is made when a device
+changes, as the coordinator compares the last data with the new to find what
+has changed.  A device that has not changed keeps the same record.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+from .const import INTERNED_PARAMETERS
+
+
+class RecordLayout:
+    """Class to hold the parameter names of devices with the same parameters."""
+
+    __slots__ = ("index", "keys")
+
+    def __init__(self, keys: tuple[str, ...]) -> None:
+        """Initialise."""
+        self.keys = keys
+        # Where each parameter is in a record's values
+        self.index = {key: position for position, key in enumerate(keys)}
+
+
+class DeviceRecord(Mapping[str, Any]):
+    """A read only mapping of a device's parameters to their values."""
+
+    __slots__ = ("_values", "layout")
+
+    def __init__(self, layout: RecordLayout, values: tuple[Any, ...]) -> None:
+        """Initialise."""
+        self.layout = layout
+        self._values = values
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the value of a parameter."""
+        return self._values[self.layout.index[key]]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the value of a parameter, or default if there is not one.
+
+        This is what our entities call, so it does not go through __getitem__.
+        """
+        position = self.layout.index.get(key)
+        return default if position is None else self._values[position]
+
+    def __contains__(self, key: object) -> bool:
+        """Return if the device has a parameter."""
+        return key in self.layout.index
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate the parameter names."""
+        return iter(self.layout.keys)
+
+    def __len__(self) -> int:
+        """Return the number of parameters."""
+        return len(self.layout.keys)
+
+    def __eq__(self, other: object) -> bool:
+        """Return if other has the same parameters and values."""
+        if other is self:
+            return True
+        if isinstance(other, DeviceRecord) and other.layout is self.layout:
+            return other._values == self._values
+        if isinstance(other, Mapping):
+            return self.as_dict() == dict(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        """Return the record as a dict."""
+        return f"DeviceRecord({self.as_dict()!r})"
+
+    def changed_parameters(self, other: "DeviceRecord") -> set[str]:
+        """Return the parameters whose values differ from another record."""
+        if other.layout is self.layout:
+            return {
+                key
+                for key, value, other_value in zip(
+                    self.layout.keys, self._values, other._values, strict=True
+                )
+                if value != other_value
+            }
+        return {
+            key
+            for key in self.layout.index.keys() | other.layout.index.keys()
+            if self.get(key) != other.get(key)
+        }
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the device as a dict.
+
+        HA's json encoder calls this, so records can be saved to storage as they
+        are.
+        """
+        return dict(zip(self.layout.keys, self._values, strict=True))
+
+
+class DeviceRecords:
+    """Make DeviceRecords, sharing layouts and strings between them.
+
+    Keep one of these for as long as the devices, so records of the same device
+    from one update to the next share them too.
+    """
+
+    def __init__(self, interned: Iterable[str] = INTERNED_PARAMETERS) -> None:
+        """Initialise."""
+        self.interned = frozenset(interned)
+        self.layouts: dict[tuple[str, ...], RecordLayout] = {}
+        self.strings: dict[str, str] = {}
+
+    def _intern(self, key: str, value: Any) -> Any:
+        """Return the shared copy of a value, if it is one we intern."""
+        if key in self.interned and isinstance(value, str):
+            return self.strings.setdefault(value, value)
+        return value
+
+    def record(self, device: Mapping[str, Any]) -> DeviceRecord:
+        """Return a record of a device."""
+        if isinstance(device, DeviceRecord):
+            return device
+        keys = tuple(device)
+        if (layout := self.layouts.get(keys)) is None:
+            layout = self.layouts[keys] = RecordLayout(keys)
+        return DeviceRecord(
+            layout, tuple(self._intern(key, value) for key, value in device.items())
+        )
+
+    def merge(self, current: DeviceRecord, update: Mapping[str, Any]) -> DeviceRecord:
+        """Return a record of a device with new values for some of its parameters.
+
+        If none of the values have changed, this is the current record.
+        """
+        index = current.layout.index
+        current_values = current._values
+        values: list[Any] | None = None
+        for key, value in update.items():
+            if (position := index.get(key)) is None:
+                # A parameter the device did not have before, so a new layout
+                return self.record(current.as_dict() | dict(update))
+            if current_values[position] != value:
+                if values is None:
+                    values = list(current_values)
+                values[position] = self._intern(key, value)
+        if values is None:
+            return current
+        return DeviceRecord(current.layout, tuple(values))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the layouts and strings shared, for diagnostics."""
+        return {
+            "layouts": len(self.layouts),
+            "interned_strings": len(self.strings),
+        }
@@ -12,28 +12,97 @@ if you so wish, or mix and match to suit.
 
 from dataclasses import dataclass
 import logging
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.const import (
+    EntityCategory,
+    Platform,
     UnitOfElectricCurrent,
     UnitOfElectricPotential,
     UnitOfEnergy,
+    UnitOfInformation,
     UnitOfTemperature,
+    UnitOfTime,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import MyConfigEntry
 from .base import ExampleBaseEntity
+from .const import DOMAIN
 from .coordinator import ExampleCoordinator
+from .stats import (
+    DECODE_TIME,
+    DEVICE_COUNT,
+    ENTITY_WRITES,
+    EXECUTOR_WAIT,
+    FETCH_TIME,
+    PAYLOAD_BYTES,
+    UPDATE_ENTITIES_TIME,
+    Histogram,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
+# ----------------------------------------------------------------------------
+# The refresh statistics to show as sensors on the hub device.
+# The key is the statistic in stats.py.
+# ----------------------------------------------------------------------------
+HUB_STATISTIC_SENSORS = (
+    SensorEntityDescription(
+        key=FETCH_TIME,
+        name="Fetch time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key=DECODE_TIME,
+        name="Decode time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key=PAYLOAD_BYTES,
+        name="Payload size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+    ),
+    SensorEntityDescription(
+        key=DEVICE_COUNT,
+        name="Devices",
+    ),
+    SensorEntityDescription(
+        key=ENTITY_WRITES,
+        name="Entity writes per refresh",
+    ),
+    SensorEntityDescription(
+        key=UPDATE_ENTITIES_TIME,
+        name="Update entities time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key=EXECUTOR_WAIT,
+        name="Executor wait",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=1,
+    ),
+)
+
+
 @dataclass
 class SensorTypeClass:
     """Class for holding sensor type to sensor class."""
@@ -57,26 +126,33 @@ async def async_setup_entry(
     # for each one.
     # This maybe different in your specific case, depending on how your data is
     # structured
+    # See entity_factory.py for which device parameters have sensors.
     # ----------------------------------------------------------------------------
 
-    sensor_types = [
-        SensorTypeClass("current", ExampleCurrentSensor),
-        SensorTypeClass("energy_delivered", ExampleEnergySensor),
-        SensorTypeClass("off_timer", ExampleOffTimerSensor),
-        SensorTypeClass("temperature", ExampleTemperatureSensor),
-        SensorTypeClass("voltage", ExampleVoltageSensor),
-    ]
+    sensor_types = {
+        sensor_type.type: sensor_type.sensor_class
+        for sensor_type in (
+            SensorTypeClass("current", ExampleCurrentSensor),
+            SensorTypeClass("energy_delivered", ExampleEnergySensor),
+            SensorTypeClass("off_timer", ExampleOffTimerSensor),
+            SensorTypeClass("temperature", ExampleTemperatureSensor),
+            SensorTypeClass("voltage", ExampleVoltageSensor),
+        )
+    }
 
-    sensors = []
+    sensors = [
+        sensor_types[entity.parameter](coordinator, entity.device, entity.parameter)
+        for entity in coordinator.get_entity_descriptions(Platform.SENSOR)
+    ]
 
-    for sensor_type in sensor_types:
-        sensors.extend(
-            [
-                sensor_type.sensor_class(coordinator, device, sensor_type.type)
-                for device in coordinator.data
-                if device.get(sensor_type.type)
-            ]
-        )
+    # ----------------------------------------------------------------------------
+    # Add the diagnostic sensors of our refresh statistics, on the hub device.
+    # See stats.py.
+    # ----------------------------------------------------------------------------
+    sensors.extend(
+        ExampleHubStatisticSensor(coordinator, config_entry, description)
+        for description in HUB_STATISTIC_SENSORS
+    )
 
     # Now create the sensors.
     async_add_entities(sensors)
@@ -121,6 +197,16 @@ class ExampleEnergySensor(ExampleBaseSensor):
     _attr_device_class = SensorDeviceClass.ENERGY
     _attr_state_class = SensorStateClass.TOTAL_INCREASING
     _attr_native_unit_of_measurement = UnitOfEnergy.WATT_HOUR
+    _attr_suggested_display_precision = 1
+
+    @property
+    def native_value(self) -> float:
+        """Return the state of the entity.
+
+        The coordinator estimates the energy from the power between polls, so
+        this goes up smoothly rather than only when the api is polled.
+        """
+        return self.coordinator.get_energy(self.device_id)
 
 
 class ExampleOffTimerSensor(ExampleBaseSensor):
@@ -128,8 +214,19 @@ class ExampleOffTimerSensor(ExampleBaseSensor):
 
     This inherits the ExampleBaseSensor and so uses all the properties and methods
     from that class and then overrides specific attributes relevant to this sensor type.
+
+    The coordinator counts active off timers down itself, so this shows the
+    seconds left, updated every second, rather than the minutes from the last poll.
     """
 
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+
+    @property
+    def native_value(self) -> int:
+        """Return the state of the entity."""
+        return self.coordinator.get_off_timer_remaining(self.device_id)
+
 
 class ExampleTemperatureSensor(ExampleBaseSensor):
     """Class to handle temperature sensors.
@@ -153,3 +250,65 @@ class ExampleVoltageSensor(ExampleBaseSensor):
     _attr_device_class = SensorDeviceClass.VOLTAGE
     _attr_native_unit_of_measurement = UnitOfElectricPotential.VOLT
     _attr_suggested_display_precision = 0
+
+
+class ExampleHubStatisticSensor(CoordinatorEntity, SensorEntity):
+    """Implementation of a refresh statistic sensor on the hub device.
+
+    The state is the last recorded value and the attributes summarise the
+    histogram of all of them.  The attributes change on every refresh, so they
+    are not recorded in the history database.
+    """
+
+    coordinator: ExampleCoordinator
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _unrecorded_attributes = frozenset({"count", "mean", "min", "max", "p50", "p95"})
+
+    def __init__(
+        self,
+        coordinator: ExampleCoordinator,
+        config_entry: MyConfigEntry,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialise sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self.histogram: Histogram = coordinator.stats.histograms[description.key]
+        self._written_count = -1
+        self._attr_unique_id = f"{DOMAIN}-{config_entry.entry_id}-{description.key}"
+        self._attr_device_info = DeviceInfo(
+            name=config_entry.title,
+            manufacturer="ACME Manufacturer",
+            model="Hub",
+            identifiers={(DOMAIN, config_entry.entry_id)},
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if a new value has been recorded."""
+        if self.histogram.count == self._written_count:
+            return
+        self._written_count = self.histogram.count
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return True, as the statistics are still valid while the api is down."""
+        return True
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the entity."""
+        return self.histogram.last
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the histogram summary."""
+        summary = self.histogram.as_dict()
+        return {
+            attribute: summary[attribute]
+            for attribute in ("count", "mean", "min", "max", "p50", "p95")
+        }
@@ -12,18 +12,36 @@ Both examples are shown here.  Running services on different threads can cause i
 https://developers.home-assistant.io/docs/dev_101_services/
 """
 
+import asyncio
+from collections.abc import Iterable, Mapping
+import logging
+from typing import Any
+
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_DEVICE_ID, ATTR_NAME
 from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse, callback
 from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
 import homeassistant.helpers.device_registry as dr
 
-from .const import DOMAIN, RENAME_DEVICE_SERVICE_NAME, RESPONSE_SERVICE_NAME
+from .const import (
+    DOMAIN,
+    RENAME_DEVICE_SERVICE_NAME,
+    RENAME_DEVICES_SERVICE_NAME,
+    RESPONSE_SERVICE_NAME,
+)
 from .coordinator import ExampleCoordinator
 
+_LOGGER = logging.getLogger(__name__)
+
 ATTR_TEXT = "text"
+ATTR_DEVICES = "devices"
+ATTR_DEVICE_IDS = "device_ids"
+ATTR_DEVICE_TYPES = "device_types"
+ATTR_FIELDS = "fields"
+ALL_DEVICES = "all"
 
 # Services schemas
 RENAME_DEVICE_SERVICE_SCHEMA = vol.Schema(
@@ -33,12 +51,34 @@ RENAME_DEVICE_SERVICE_SCHEMA = vol.Schema(
     }
 )
 
-RESPONSE_SERVICE_SCHEMA = vol.Schema(
+RENAME_DEVICES_SERVICE_SCHEMA = vol.Schema(
     {
-        vol.Required(ATTR_DEVICE_ID): int,
+        vol.Required(ATTR_DEVICES): vol.All(
+            cv.ensure_list, [RENAME_DEVICE_SERVICE_SCHEMA], vol.Length(min=1)
+        ),
     }
 )
 
+# ----------------------------------------------------------------------------
+# The response service takes one device id or, for many devices at once, a list
+# of device ids (or "all") or a list of device types.
+# vol.Exclusive means only one of these can be given and
+# cv.has_at_least_one_key that one of them must be.
+# ----------------------------------------------------------------------------
+RESPONSE_SERVICE_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Exclusive(ATTR_DEVICE_ID, "devices"): int,
+            vol.Exclusive(ATTR_DEVICE_IDS, "devices"): vol.Any(
+                ALL_DEVICES, vol.All(cv.ensure_list, [vol.Coerce(int)])
+            ),
+            vol.Exclusive(ATTR_DEVICE_TYPES, "devices"): vol.All(cv.ensure_list, [str]),
+            vol.Optional(ATTR_FIELDS): vol.All(cv.ensure_list, [str]),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_DEVICE_ID, ATTR_DEVICE_IDS, ATTR_DEVICE_TYPES),
+)
+
 
 class ExampleServicesSetup:
     """Class to handle Integration Services."""
@@ -64,6 +104,18 @@ class ExampleServicesSetup:
             schema=RENAME_DEVICE_SERVICE_SCHEMA,
         )
 
+        # ----------------------------------------------------------------------------
+        # The same service for many devices at once.  This can optionally return a
+        # response of which devices were renamed.
+        # ----------------------------------------------------------------------------
+        self.hass.services.async_register(
+            DOMAIN,
+            RENAME_DEVICES_SERVICE_NAME,
+            self.rename_devices,
+            schema=RENAME_DEVICES_SERVICE_SCHEMA,
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
         # ----------------------------------------------------------------------------
         # The definition here for a response service is the same as before but you
         # must include supports_response = only/optional
@@ -89,59 +141,167 @@ class ExampleServicesSetup:
         device_id = service_call.data[ATTR_DEVICE_ID]
         device_name = service_call.data[ATTR_NAME]
 
-        # check for valid device id
-        try:
-            assert self.coordinator.get_device(device_id) is not None
-        except AssertionError as ex:
-            raise HomeAssistantError(
-                "Error calling service: The device ID does not exist"
-            ) from ex
-        else:
-            result = await self.hass.async_add_executor_job(
-                self.coordinator.api.set_data, device_id, "device_name", device_name
-            )
+        renamed, errors = await self.async_rename_devices({device_id: device_name})
+        if not renamed:
+            raise HomeAssistantError(f"Error calling service: {errors[device_id]}")
 
-            if result:
-                # ----------------------------------------------------------------------------
-                # In this scenario, we would need to update the device registry name here
-                # as it will not automatically update.
-                # ----------------------------------------------------------------------------
+    async def rename_devices(self, service_call: ServiceCall) -> dict[str, Any]:
+        """Execute rename devices service call function.
 
-                # Get our device from coordinator data to retrieve its devie_uid as that is
-                # what we used in the devices identifiers.
-                device = self.coordinator.get_device(device_id)
+        This renames many devices in one call and returns which were renamed and
+        why any others were not.
+        """
+        names = {
+            device[ATTR_DEVICE_ID]: device[ATTR_NAME]
+            for device in service_call.data[ATTR_DEVICES]
+        }
+        renamed, errors = await self.async_rename_devices(names)
+        return {
+            "renamed": renamed,
+            "failed": [
+                {"device_id": device_id, "error": error}
+                for device_id, error in errors.items()
+            ],
+        }
 
-                # Get the device registry
-                device_registry = dr.async_get(self.hass)
+    async def async_rename_devices(
+        self, names: dict[int, str]
+    ) -> tuple[list[int], dict[int, str]]:
+        """Rename devices on the api and in the device registry.
 
-                # Get the device entry in the registry by its identifiers.  This is the same as
-                # we used to set them in base.py
-                device_entry = device_registry.async_get_device(
-                    [(DOMAIN, device["device_uid"])]
-                )
+        Returns the device ids that were renamed and the error for each that was
+        not.
+        """
+        # check for valid device ids, before renaming any of them
+        devices = {
+            device_id: self.coordinator.get_device(device_id) for device_id in names
+        }
+        if missing := [
+            device_id for device_id, device in devices.items() if device is None
+        ]:
+            raise HomeAssistantError(
+                f"Error calling service: The device ID does not exist: {missing}"
+            )
 
-                # Update our device entry with the new name.  You will see this change in the UI
-                device_registry.async_update_device(device_entry.id, name=device_name)
+        # ----------------------------------------------------------------------------
+        # Send the renames all at once.  They go via the coordinator command queue,
+        # which limits how many requests are sent to the api at the same time.
+        # ----------------------------------------------------------------------------
+        results = await asyncio.gather(
+            *(
+                self.coordinator.async_set_data(device_id, "device_name", name)
+                for device_id, name in names.items()
+            ),
+            return_exceptions=True,
+        )
+        renamed = {}
+        errors = {}
+        for device_id, result in zip(names, results, strict=True):
+            if isinstance(result, Exception):
+                _LOGGER.error("Error renaming device %s: %s", device_id, result)
+                errors[device_id] = str(result) or type(result).__name__
+            elif not result:
+                errors[device_id] = "The api did not rename the device"
+            else:
+                # Index by device_uid, as that is what we used in the device
+                # identifiers in base.py
+                renamed[devices[device_id]["device_uid"]] = device_id
 
+        if renamed:
+            # ----------------------------------------------------------------------------
+            # In this scenario, we would need to update the device registry name here
+            # as it will not automatically update.
+            # We go through our devices in the registry once, rather than looking up
+            # each renamed device.
+            # ----------------------------------------------------------------------------
+            device_registry = dr.async_get(self.hass)
+            for device_entry in dr.async_entries_for_config_entry(
+                device_registry, self.config_entry.entry_id
+            ):
+                for domain, device_uid in device_entry.identifiers:
+                    if domain == DOMAIN and device_uid in renamed:
+                        # Update our device entry with the new name.  You will see
+                        # this change in the UI
+                        device_registry.async_update_device(
+                            device_entry.id, name=names[renamed[device_uid]]
+                        )
+
+            # One refresh for all the renames.  The names are in the slow polling
+            # tier, which the coordinator marked due when it sent them, so this
+            # fetches the new names rather than rolling them back when they time out.
             await self.coordinator.async_request_refresh()
 
+        return list(renamed.values()), errors
+
     @callback
-    def async_response_service(self, service_call: ServiceCall) -> None:
+    def async_response_service(self, service_call: ServiceCall) -> dict[str, Any]:
         """Execute response service call function.
 
         This will take a device id and return json data for the
         devices info on the api.
 
         If the device does not exist, it will raise an error.
+
+        Alternatively, it will take a list of device ids (or "all") or device types
+        and return the devices info for all of them in one call, as
+        {"devices": [...], "not_found": [...]}, where not_found lists the device ids
+        and device types that did not match any device.  Optionally, fields limits
+        the info returned to just those fields.
         """
-        device_id = service_call.data[ATTR_DEVICE_ID]
-        response = self.coordinator.get_device(device_id)
+        fields = service_call.data.get(ATTR_FIELDS)
 
-        try:
-            assert response is not None
-        except AssertionError as ex:
-            raise HomeAssistantError(
-                "Error calling service: The device ID does not exist"
-            ) from ex
+        if ATTR_DEVICE_ID in service_call.data:
+            device_id = service_call.data[ATTR_DEVICE_ID]
+            response = self.coordinator.get_device(device_id)
+
+            try:
+                assert response is not None
+            except AssertionError as ex:
+                raise HomeAssistantError(
+                    "Error calling service: The device ID does not exist"
+                ) from ex
+            else:
+                return (
+                    project_device(response, fields) if fields else response.as_dict()
+                )
+
+        # ----------------------------------------------------------------------------
+        # Answer from the coordinator's indexed data, without going to the api.
+        # The devices are compact records (see records.py), so they are turned into
+        # dicts for the response, the same as for a single device.
+        # ----------------------------------------------------------------------------
+        devices: Iterable[Mapping[str, Any]]
+        not_found = []
+        if (device_ids := service_call.data.get(ATTR_DEVICE_IDS)) == ALL_DEVICES:
+            devices = self.coordinator.data.devices.values()
+        elif device_ids is not None:
+            devices = []
+            for device_id in device_ids:
+                if (device := self.coordinator.get_device(device_id)) is not None:
+                    devices.append(device)
+                else:
+                    not_found.append(device_id)
         else:
-            return response
+            devices = []
+            for device_type in service_call.data[ATTR_DEVICE_TYPES]:
+                if type_devices := self.coordinator.get_devices_by_type(device_type):
+                    devices.extend(type_devices)
+                else:
+                    not_found.append(device_type)
+
+        return {
+            "devices": [
+                project_device(device, fields) if fields else device.as_dict()
+                for device in devices
+            ],
+            "not_found": not_found,
+        }
+
+
+def project_device(device: Mapping[str, Any], fields: list[str]) -> dict[str, Any]:
+    """Return just these fields of a device, and its device_id."""
+    projected = {"device_id": device["device_id"]}
+    for parameter in fields:
+        if parameter in device:
+            projected[parameter] = device[parameter]
+    return projected
@@ -0,0 +1,207 @@
+"""Device simulator for the mock api.
+
+This is part of the api placeholder and obviously will not be needed with your
+real api.
+
+It holds the mock devices in a dict keyed by device id, so reading or writing a
+device does not need to search a list, and it can generate any number of
+synthetic devices of every device type and slowly change their sensor values,
+so the integration can be tried (and benchmarked) with thousands of devices.
+"""
+
+from collections.abc import Callable, Iterable
+import logging
+import math
+import random
+import time
+from typing import Any
+
+_LOGGER = logging.getLogger(__name__)
+
+POWERED_DEVICE_TYPES = ("SOCKET", "ON_OFF_LIGHT", "DIMMABLE_LIGHT")
+
+
+class DeviceSimulator:
+    """Simulate the devices of our api.
+
+    If evolve_interval is set, sensor values move every evolve_interval seconds,
+    as they would on real devices.
+    """
+
+    def __init__(
+        self,
+        devices: Iterable[dict[str, Any]],
+        evolve_interval: float | None = None,
+        seed: int | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialise."""
+        self.devices: dict[int, dict[str, Any]] = {
+            device["device_id"]: dict(device) for device in devices
+        }
+        # Each device's current when on, to restore when it is turned back on
+        self.rated_current: dict[int, float] = {
+            device_id: device["current"]
+            for device_id, device in self.devices.items()
+            if "current" in device
+        }
+        # When each device with an active off timer turns off, keyed by device_id
+        self.off_timers: dict[int, float] = {}
+        # Changes every time a device changes, so the api can tell if it has
+        self.version = 0
+
+        self.evolve_interval = evolve_interval
+        self.random = random.Random(seed)
+        self.clock = clock
+        self.last_evolved = clock()
+
+    @classmethod
+    def generate(
+        cls, templates: list[dict[str, Any]], count: int, **kwargs: Any
+    ) -> "DeviceSimulator":
+        """Return a simulator of count devices, cycling through the template devices."""
+        devices = []
+        for device_id in range(1, count + 1):
+            device = dict(templates[(device_id - 1) % len(templates)])
+            device["device_id"] = device_id
+            device["device_uid"] = f"sim-{device_id:08d}"
+            device["device_name"] = (
+                f"{device['device_type'].replace('_', ' ').title()} {device_id}"
+            )
+            devices.append(device)
+        return cls(devices, **kwargs)
+
+    def get_devices(self, parameters: Iterable[str] | None = None) -> list[dict]:
+        """Return a copy of every device, with only these parameters if given."""
+        if not parameters:
+            return [dict(device) for device in self.devices.values()]
+        parameters = ("device_id", *parameters)
+        return [
+            {
+                parameter: device[parameter]
+                for parameter in parameters
+                if parameter in device
+            }
+            for device in self.devices.values()
+        ]
+
+    def set_parameter(self, device_id: int, parameter: str, value: Any) -> bool:
+        """Set a device parameter.
+
+        Returns False if the device or parameter does not exist.
+        """
+        device = self.devices.get(device_id)
+        if device is None or parameter not in device:
+            return False
+
+        device[parameter] = value
+
+        # Off timers count down on the device.  See run_off_timers.
+        if parameter == "off_timer":
+            self._set_off_timer(device_id, value)
+        if parameter == "state" and value == "OFF" and "off_timer" in device:
+            self.off_timers.pop(device_id, None)
+            device["off_timer"] = "00:00"
+
+        # For sockets and lights, modify current values when off/on to mimic
+        # real api and show changing sensors from your actions.
+        if device["device_type"] in POWERED_DEVICE_TYPES and parameter == "state":
+            if value == "OFF":
+                device["current"] = 0
+            else:
+                device["current"] = self.rated_current.get(device_id)
+
+        # For dimmable lights if brightness is set to > 0, set to on
+        if device["device_type"] == "DIMMABLE_LIGHT":
+            if parameter == "brightness":
+                if value > 0:
+                    device["state"] = "ON"
+                    device["current"] = value * 0.015
+                else:
+                    device["state"] = "OFF"
+
+            if parameter == "state":
+                if value == "ON":
+                    device["brightness"] = 100
+                else:
+                    device["brightness"] = 0
+
+        _LOGGER.debug("Device Updated: %s", device)
+        self.version += 1
+        return True
+
+    def set_parameters(self, device_id: int, values: dict[str, Any]) -> bool:
+        """Set many parameters of a device, in order.
+
+        Like a real api would, this sets all of them or, if the device does not
+        have any one of them, none of them.
+        """
+        device = self.devices.get(device_id)
+        if device is None or not values or not device.keys() >= values.keys():
+            return False
+        for parameter, value in values.items():
+            self.set_parameter(device_id, parameter, value)
+        return True
+
+    def _set_off_timer(self, device_id: int, value: str) -> None:
+        """Start, or with 00:00 cancel, the off timer of a device."""
+        try:
+            hours, minutes = value.split(":")
+            seconds = (int(hours) * 60 + int(minutes)) * 60
+        except (AttributeError, ValueError):
+            seconds = 0
+        if seconds:
+            self.off_timers[device_id] = self.clock() + seconds
+        else:
+            self.off_timers.pop(device_id, None)
+
+    def run_off_timers(self) -> None:
+        """Count down off timers, turning devices off when theirs runs out.
+
+        Like a real device, the off timer shows the minutes left, rounded up.
+        """
+        if not self.off_timers:
+            return
+        now = self.clock()
+        for device_id, off_at in list(self.off_timers.items()):
+            device = self.devices[device_id]
+            if now >= off_at:
+                self.set_parameter(device_id, "state", "OFF")
+                continue
+            minutes = math.ceil((off_at - now) / 60)
+            remaining = f"{minutes // 60:02d}:{minutes % 60:02d}"
+            if device["off_timer"] != remaining:
+                device["off_timer"] = remaining
+                self.version += 1
+
+    def evolve(self) -> None:
+        """Move sensor values on by the time since they last moved."""
+        if self.evolve_interval is None:
+            return
+        now = self.clock()
+        elapsed = now - self.last_evolved
+        if elapsed < self.evolve_interval:
+            return
+        self.last_evolved = now
+
+        uniform = self.random.uniform
+        for device_id, device in self.devices.items():
+            if "voltage" in device:
+                device["voltage"] = min(
+                    max(device["voltage"] + round(uniform(-1, 1)), 225), 245
+                )
+            if device.get("state") == "ON" and device.get("current"):
+                rated = self.rated_current.get(device_id) or device["current"]
+                device["current"] = round(rated * uniform(0.95, 1.05), 3)
+            if "energy_delivered" in device and device.get("current"):
+                # Wh from V x A over the elapsed seconds
+                device["energy_delivered"] = round(
+                    device["energy_delivered"]
+                    + device["voltage"] * device["current"] * elapsed / 3600,
+                    3,
+                )
+            if "temperature" in device:
+                device["temperature"] = round(
+                    device["temperature"] + uniform(-0.1, 0.1), 1
+                )
+        self.version += 1
@@ -0,0 +1,162 @@
+"""Performance statistics for our integration.
+
+To see what a refresh costs, the coordinator and api record how long each part
+takes, ie fetching and decoding the data and updating the entities, and how big
+it was.  These are shown as diagnostic sensors on the hub device and in the
+diagnostics download.
+
+Each statistic is kept in a histogram, which counts values in a fixed set of
+buckets rather than keeping every value, so it uses the same memory however
+long HA runs and can still tell you the median or 95th percentile.
+"""
+
+import asyncio
+from bisect import bisect_left
+from collections.abc import Callable
+import threading
+import time
+from typing import Any
+
+# ----------------------------------------------------------------------------
+# The statistics we record.  Times are in milliseconds.
+# ----------------------------------------------------------------------------
+FETCH_TIME = "fetch_time"
+DECODE_TIME = "decode_time"
+PAYLOAD_BYTES = "payload_bytes"
+DEVICE_COUNT = "device_count"
+ENTITY_WRITES = "entity_writes"
+UPDATE_ENTITIES_TIME = "update_entities_time"
+EXECUTOR_WAIT = "executor_wait"
+
+
+def exponential_bounds(start: float, factor: float, count: int) -> tuple[float, ...]:
+    """Return count bucket upper bounds, starting at start and growing by factor."""
+    return tuple(start * factor**index for index in range(count))
+
+
+TIME_BOUNDS = exponential_bounds(0.01, 2, 24)  # 10us to 84s
+SIZE_BOUNDS = exponential_bounds(256, 2, 24)  # 256B to 2GB
+COUNT_BOUNDS = exponential_bounds(1, 2, 21)  # 1 to 1M
+
+STATISTIC_BOUNDS = {
+    FETCH_TIME: TIME_BOUNDS,
+    DECODE_TIME: TIME_BOUNDS,
+    PAYLOAD_BYTES: SIZE_BOUNDS,
+    DEVICE_COUNT: COUNT_BOUNDS,
+    ENTITY_WRITES: COUNT_BOUNDS,
+    UPDATE_ENTITIES_TIME: TIME_BOUNDS,
+    EXECUTOR_WAIT: TIME_BOUNDS,
+}
+
+
+class Histogram:
+    """Count values in buckets, so memory use is fixed.
+
+    Buckets grow exponentially, so a percentile is accurate to within a factor
+    of the bucket growth, whatever the size of the values.
+
+    The api sync methods run in executor threads, so recording is locked.
+    """
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        """Initialise."""
+        self.bounds = bounds
+        # One more bucket than bounds, for values above the last bound
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.minimum: float | None = None
+        self.maximum: float | None = None
+        self.last: float | None = None
+        self._lock = threading.Lock()
+
+    def record(self, value: float) -> None:
+        """Record a value."""
+        with self._lock:
+            self.buckets[bisect_left(self.bounds, value)] += 1
+            self.count += 1
+            self.total += value
+            self.last = value
+            if self.minimum is None or value < self.minimum:
+                self.minimum = value
+            if self.maximum is None or value > self.maximum:
+                self.maximum = value
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the recorded values."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the upper bound of the bucket that holds this percentile."""
+        if not self.count:
+            return None
+        rank = self.count * percent / 100
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                if index == len(self.bounds):
+                    return self.maximum
+                # No more than the largest value, for a mostly empty top bucket
+                return min(self.bounds[index], self.maximum)
+        return self.maximum
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram summary."""
+        return {
+            "count": self.count,
+            "last": self.last,
+            "mean": self.mean,
+            "min": self.minimum,
+            "max": self.maximum,
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "p99": self.percentile(99),
+        }
+
+
+class RefreshStats:
+    """Histograms of the cost of our refreshes."""
+
+    def __init__(self) -> None:
+        """Initialise."""
+        self.histograms = {
+            statistic: Histogram(bounds)
+            for statistic, bounds in STATISTIC_BOUNDS.items()
+        }
+
+    def record(self, statistic: str, value: float) -> None:
+        """Record a value of a statistic."""
+        self.histograms[statistic].record(value)
+
+    def record_time(self, statistic: str, started: float) -> None:
+        """Record the milliseconds since started, from time.perf_counter."""
+        self.record(statistic, (time.perf_counter() - started) * 1000)
+
+    async def async_run_in_executor[T](self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking function in the executor.
+
+        Records how long it waited for an executor thread, which shows if HA's
+        executor is too busy to run our requests when they are sent.
+        """
+        started: float | None = None
+
+        def job() -> T:
+            nonlocal started
+            started = time.perf_counter()
+            return func(*args)
+
+        submitted = time.perf_counter()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, job)
+        finally:
+            if started is not None:
+                self.record(EXECUTOR_WAIT, (started - submitted) * 1000)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the statistics for diagnostics."""
+        return {
+            statistic: histogram.as_dict()
+            for statistic, histogram in self.histograms.items()
+        }
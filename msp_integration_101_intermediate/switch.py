@@ -4,6 +4,7 @@ import logging
 from typing import Any
 
 from homeassistant.components.switch import SwitchDeviceClass, SwitchEntity
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
@@ -29,12 +30,12 @@ async def async_setup_entry(
     # for each one.
     # This maybe different in your specific case, depending on how your data is
     # structured
+    # See entity_factory.py for which devices have switches.
     # ----------------------------------------------------------------------------
 
     switches = [
-        ExampleSwitch(coordinator, device, "state")
-        for device in coordinator.data
-        if device.get("device_type") == "SOCKET"
+        ExampleSwitch(coordinator, entity.device, entity.parameter)
+        for entity in coordinator.get_entity_descriptions(Platform.SWITCH)
     ]
 
     # Create the binary sensors.
@@ -51,6 +52,7 @@ class ExampleSwitch(ExampleBaseEntity, SwitchEntity):
     """
 
     _attr_device_class = SwitchDeviceClass.SWITCH
+    _watched_parameters = ("last_reboot",)
 
     @property
     def is_on(self) -> bool | None:
@@ -63,33 +65,25 @@ class ExampleSwitch(ExampleBaseEntity, SwitchEntity):
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
-        await self.hass.async_add_executor_job(
-            self.coordinator.api.set_data, self.device_id, self.parameter, "ON"
-        )
+        await self.coordinator.async_set_data(self.device_id, self.parameter, "ON")
         # ----------------------------------------------------------------------------
-        # Use async_refresh on the DataUpdateCoordinator to perform immediate update.
-        # Using self.async_update or self.coordinator.async_request_refresh may delay update due
-        # to trying to batch requests.
+        # The coordinator shows the new state on the entity straight away and the
+        # next refresh confirms it, so there is no need to force a refresh here.
         # ----------------------------------------------------------------------------
-        await self.coordinator.async_refresh()
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
-        await self.hass.async_add_executor_job(
-            self.coordinator.api.set_data, self.device_id, self.parameter, "OFF"
-        )
+        await self.coordinator.async_set_data(self.device_id, self.parameter, "OFF")
         # ----------------------------------------------------------------------------
-        # Use async_refresh on the DataUpdateCoordinator to perform immediate update.
-        # Using self.async_update or self.coordinator.async_request_refresh may delay update due
-        # to trying to batch requests.
+        # The coordinator shows the new state on the entity straight away and the
+        # next refresh confirms it, so there is no need to force a refresh here.
         # ----------------------------------------------------------------------------
-        await self.coordinator.async_refresh()
 
     @property
     def extra_state_attributes(self):
         """Return the extra state attributes."""
         # Add any additional attributes you want on your sensor.
-        attrs = {}
+        attrs = super().extra_state_attributes or {}
         attrs["last_rebooted"] = self.coordinator.get_device_parameter(
             self.device_id, "last_reboot"
         )
@@ -0,0 +1,109 @@
+"""Off timers for our integration.
+
+Our lights can be given an off timer, which counts down on the device and turns
+it off when it gets to zero.  The api only tells us the minutes left when we
+poll it, so the off timer sensor would lag and we would need to poll often to
+see the light turn off.
+
+Instead, the coordinator counts active off timers down itself, updating the
+sensors every second, and only refreshes from the api when one runs out, to
+confirm the device has turned off.
+
+Timers are kept in a timer wheel, a ring of slots, one per second.  A timer goes
+in the slot for the second it runs out, so each tick only has to look at the
+timers in one slot, however many are running.  Timers longer than the wheel just
+stay in their slot until it comes round on their last lap.
+
+https://en.wikipedia.org/wiki/Timing_wheel
+"""
+
+import math
+
+from .const import OFF_TIMER_WHEEL_SLOTS
+
+
+def parse_off_timer(value: str | None) -> int:
+    """Return the seconds of an api off timer value, in HH:MM."""
+    if not value:
+        return 0
+    try:
+        hours, minutes = value.split(":")
+        return (int(hours) * 60 + int(minutes)) * 60
+    except ValueError:
+        return 0
+
+
+class OffTimerWheel:
+    """Keep track of when the active off timers run out.
+
+    Times are in seconds from the event loop clock.  The wheel is moved on by
+    one tick a second, on the whole second, so a timer goes in the slot of the
+    first whole second at or after its deadline and runs out on that tick.  The
+    deadline itself is kept as it was set, for the time left.
+    """
+
+    def __init__(self, slots: int = OFF_TIMER_WHEEL_SLOTS) -> None:
+        """Initialise."""
+        self.slots: list[set[int]] = [set() for _ in range(slots)]
+        # When each device's timer runs out, keyed by device_id
+        self.deadlines: dict[int, float] = {}
+        # The last second the wheel has been moved on to
+        self.position: int | None = None
+        self.expired = 0
+
+    def __len__(self) -> int:
+        """Return the number of active timers."""
+        return len(self.deadlines)
+
+    def add(self, device_id: int, deadline: float) -> None:
+        """Add or move the timer of a device."""
+        self.remove(device_id)
+        self.deadlines[device_id] = deadline
+        self._slot(deadline).add(device_id)
+
+    def remove(self, device_id: int) -> bool:
+        """Remove the timer of a device.  Returns False if it did not have one."""
+        if (deadline := self.deadlines.pop(device_id, None)) is None:
+            return False
+        self._slot(deadline).discard(device_id)
+        return True
+
+    def _slot(self, deadline: float) -> set[int]:
+        """Return the slot of the tick a timer with this deadline runs out on."""
+        return self.slots[math.ceil(deadline) % len(self.slots)]
+
+    def remaining(self, device_id: int, now: float) -> int | None:
+        """Return the whole seconds left on a device's timer, or None if it has none."""
+        if (deadline := self.deadlines.get(device_id)) is None:
+            return None
+        return max(math.ceil(deadline - now), 0)
+
+    def advance(self, now: float) -> list[int]:
+        """Move the wheel on to now and return the devices whose timers ran out."""
+        current = math.floor(now)
+        if self.position is None:
+            self.position = current
+            seconds = [current]
+        else:
+            # If ticks were missed, every slot is looked at no more than once
+            start = max(self.position + 1, current - len(self.slots) + 1)
+            seconds = range(start, current + 1)
+        self.position = current
+
+        expired = []
+        for second in seconds:
+            slot = self.slots[second % len(self.slots)]
+            expired.extend(
+                device_id for device_id in slot if self.deadlines[device_id] <= current
+            )
+        for device_id in expired:
+            self.remove(device_id)
+        self.expired += len(expired)
+        return expired
+
+    def as_dict(self, now: float) -> dict[str, int | None]:
+        """Return the remaining seconds of the active timers, for diagnostics."""
+        return {
+            str(device_id): self.remaining(device_id, now)
+            for device_id in self.deadlines
+        }
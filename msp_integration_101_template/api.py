@@ -32,9 +32,13 @@ DEVICES = [
 ]
 
 
-@dataclass
+@dataclass(slots=True)
 class Device:
-    """API device."""
+    """API device.
+
+    A new one is made for every device on every update, so it has slots, which
+    makes it smaller and quicker to create than a class with a __dict__.
+    """
 
     device_id: int
     device_unique_id: str
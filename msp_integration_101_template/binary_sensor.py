@@ -109,4 +109,7 @@ class ExampleBinarySensor(CoordinatorEntity, BinarySensorEntity):
         # Add any additional attributes you want on your sensor.
         attrs = {}
         attrs["extra_info"] = "Extra Info"
+        # Show that the state is from the cache until the api is read.
+        if self.coordinator.cache.restored:
+            attrs["restored"] = True
         return attrs
@@ -4,3 +4,12 @@ DOMAIN = "msp_integration_101_template"
 
 DEFAULT_SCAN_INTERVAL = 60
 MIN_SCAN_INTERVAL = 10
+
+# Wait this many seconds after the api data changes before saving it to the cache
+CACHE_SAVE_DELAY = 60
+
+# Adaptive polling polls faster while devices change and backs off to this maximum
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+MAX_SCAN_INTERVAL = 300
+ADAPTIVE_BACKOFF_FACTOR = 2
+ADAPTIVE_HISTORY_SIZE = 20
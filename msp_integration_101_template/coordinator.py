@@ -11,11 +11,13 @@ from homeassistant.const import (
     CONF_SCAN_INTERVAL,
     CONF_USERNAME,
 )
-from homeassistant.core import DOMAIN, HomeAssistant
+from homeassistant.core import DOMAIN, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import API, APIAuthError, Device, DeviceType
-from .const import DEFAULT_SCAN_INTERVAL
+from .cache import SnapshotCache
+from .const import CONF_ADAPTIVE_POLLING, DEFAULT_SCAN_INTERVAL
+from .polling import AdaptivePolling
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,6 +48,12 @@ class ExampleCoordinator(DataUpdateCoordinator):
             CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
         )
 
+        # If adaptive polling is enabled, the scan interval is adjusted after every
+        # update.  See polling.py.
+        self.adaptive_polling: AdaptivePolling | None = None
+        if config_entry.options.get(CONF_ADAPTIVE_POLLING, False):
+            self.adaptive_polling = AdaptivePolling(self.poll_interval)
+
         # Initialise DataUpdateCoordinator
         super().__init__(
             hass,
@@ -61,6 +69,10 @@ class ExampleCoordinator(DataUpdateCoordinator):
         # Initialise your api here
         self.api = API(host=self.host, user=self.user, pwd=self.pwd)
 
+        # The last good api data is saved, so on the next start entities can be
+        # created from it without waiting for the api.  See cache.py.
+        self.cache = SnapshotCache(hass, config_entry)
+
     async def async_update_data(self):
         """Fetch data from API endpoint.
 
@@ -78,8 +90,53 @@ class ExampleCoordinator(DataUpdateCoordinator):
             # This will show entities as unavailable by raising UpdateFailed exception
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
+        # Poll faster while devices are changing, slower when they are not.
+        # The DataUpdateCoordinator schedules the next refresh with update_interval
+        # after this update finishes, so setting it here takes effect straight away.
+        if self.adaptive_polling and self.data is not None:
+            self.update_interval = timedelta(
+                seconds=self.adaptive_polling.update(self.count_changes(devices))
+            )
+
+        data = ExampleAPIData(self.api.controller_name, devices)
+        self.async_save_cache(data)
+
         # What is returned here is stored in self.data by the DataUpdateCoordinator
-        return ExampleAPIData(self.api.controller_name, devices)
+        return data
+
+    async def async_load_cache(self) -> bool:
+        """Load the last saved api data into the coordinator.
+
+        Returns False if there is no saved data.
+        """
+        if not (cached := await self.cache.async_load()):
+            return False
+        self.data = ExampleAPIData(
+            cached["controller_name"],
+            [
+                Device(**device | {"device_type": DeviceType(device["device_type"])})
+                for device in cached["devices"]
+            ],
+        )
+        return True
+
+    @callback
+    def async_save_cache(self, data: ExampleAPIData) -> None:
+        """Save live api data to the cache."""
+        # Entities no longer show restored data
+        self.cache.restored = False
+        self.cache.async_save(data)
+
+    def count_changes(self, devices: list[Device]) -> int:
+        """Return how many devices have changed since the last update."""
+        previous = {
+            (device.device_type, device.device_id): device
+            for device in self.data.devices
+        }
+        return sum(
+            previous.get((device.device_type, device.device_id)) != device
+            for device in devices
+        ) + max(len(previous) - len(devices), 0)
 
     def get_device_by_id(
         self, device_type: DeviceType, device_id: int
@@ -0,0 +1,89 @@
+"""Adaptive polling for the Integration 101 Template integration.
+
+Polling at a fixed interval is a trade off.  Poll too often and you load the
+device and HA for no reason when nothing is happening.  Poll too slowly and
+changes take a long time to show.
+
+This scheduler works out the next scan interval from what the last update found.
+While devices are changing (or just after we have sent a command) it polls more
+often, down to the minimum scan interval, and when nothing changes it backs off
+exponentially up to a maximum.
+"""
+
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ADAPTIVE_BACKOFF_FACTOR,
+    ADAPTIVE_HISTORY_SIZE,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+)
+
+
+@dataclass
+class PollingDecision:
+    """Class to hold a scan interval decision."""
+
+    time: str
+    reason: str
+    changes: int
+    interval: float
+
+
+class AdaptivePolling:
+    """Work out the scan interval from the rate of change of our devices."""
+
+    def __init__(
+        self,
+        scan_interval: float,
+        minimum: float = MIN_SCAN_INTERVAL,
+        maximum: float = MAX_SCAN_INTERVAL,
+        factor: float = ADAPTIVE_BACKOFF_FACTOR,
+    ) -> None:
+        """Initialise."""
+        # The configured scan interval can never take us below the minimum
+        self.minimum = max(minimum, 1)
+        self.maximum = max(maximum, scan_interval, self.minimum)
+        self.factor = factor
+        self.interval = float(max(scan_interval, self.minimum))
+        self.history: deque[PollingDecision] = deque(maxlen=ADAPTIVE_HISTORY_SIZE)
+
+    def update(self, changes: int) -> float:
+        """Return the next scan interval after an update with this many changes."""
+        if changes:
+            self._set_interval(self.interval / self.factor, "changed", changes)
+        else:
+            self._set_interval(self.interval * self.factor, "unchanged", changes)
+        return self.interval
+
+    def activity(self, reason: str) -> float:
+        """Return the next scan interval after we have changed a device.
+
+        A command means we expect the device to change, so poll at the minimum
+        interval to confirm it as soon as we can.
+        """
+        self._set_interval(self.minimum, reason, 1)
+        return self.interval
+
+    def _set_interval(self, interval: float, reason: str, changes: int) -> None:
+        """Set the interval, keeping it between the minimum and maximum."""
+        self.interval = float(min(max(interval, self.minimum), self.maximum))
+        self.history.append(
+            PollingDecision(
+                dt_util.utcnow().isoformat(), reason, changes, self.interval
+            )
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the scheduler state for diagnostics."""
+        return {
+            "effective_interval": self.interval,
+            "minimum_interval": self.minimum,
+            "maximum_interval": self.maximum,
+            "backoff_factor": self.factor,
+            "history": [asdict(decision) for decision in self.history],
+        }
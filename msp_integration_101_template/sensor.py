@@ -123,4 +123,7 @@ class ExampleSensor(CoordinatorEntity, SensorEntity):
         # Add any additional attributes you want on your sensor.
         attrs = {}
         attrs["extra_info"] = "Extra Info"
+        # Show that the state is from the cache until the api is read.
+        if self.coordinator.cache.restored:
+            attrs["restored"] = True
         return attrs
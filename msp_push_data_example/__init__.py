@@ -13,6 +13,7 @@ from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.helpers.device_registry import DeviceEntry
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
+from .cache import SnapshotCache
 from .const import DOMAIN
 from .coordinator import ExampleCoordinator
 
@@ -37,15 +38,22 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: MyConfigEntry) ->
     # This is defined in coordinator.py
     coordinator = ExampleCoordinator(hass, config_entry)
 
-    # Perform an initial data load from api.
-    # async_config_entry_first_refresh() is special in that it does not log errors if it fails
-    await coordinator.async_config_entry_first_refresh()
-
-
-    # Test to see if api initialised correctly, else raise ConfigNotReady to make HA retry setup
-    # TODO: Change this to match how your api will know if connected or successful update
-    if not coordinator.api.connected:
-        raise ConfigEntryNotReady
+    # If we have saved api data from last time, create the entities from that and
+    # get live data in the background, so a slow or offline api does not hold up
+    # starting HA.
+    if await coordinator.async_load_cache():
+        config_entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+    else:
+        # Perform an initial data load from api.
+        # async_config_entry_first_refresh() is special in that it does not log errors if it fails
+        await coordinator.async_config_entry_first_refresh()
+
+        # Test to see if api initialised correctly, else raise ConfigNotReady to make HA retry setup
+        # TODO: Change this to match how your api will know if connected or successful update
+        if not coordinator.api.connected:
+            raise ConfigEntryNotReady
 
     # Initialise a listener for config flow options changes.
     # This will be removed automatically if the integraiton is unloaded.
@@ -84,6 +92,11 @@ async def async_remove_config_entry_device(
     return True
 
 
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the saved api data when the integration is removed."""
+    await SnapshotCache(hass, config_entry).store.async_remove()
+
+
 async def async_unload_entry(hass: HomeAssistant, config_entry: MyConfigEntry) -> bool:
     """Unload a config entry."""
     # This is called when you remove your integration or shutdown HA.
@@ -11,6 +11,8 @@ from enum import StrEnum
 import logging
 from random import choice, randrange
 
+from .stats import RefreshStats
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -34,9 +36,13 @@ DEVICES = [
 ]
 
 
-@dataclass
+@dataclass(slots=True)
 class Device:
-    """API device."""
+    """API device.
+
+    A new one is made for every device on every update, so it has slots, which
+    makes it smaller and quicker to create than a class with a __dict__.
+    """
 
     device_id: int
     device_unique_id: str
@@ -116,11 +122,18 @@ class PushAPI(API):
     """Mimic for a push api."""
 
     def __init__(
-        self, host: str, user: str, pwd: str, message_callback: Callable | None = None
+        self,
+        host: str,
+        user: str,
+        pwd: str,
+        message_callback: Callable | None = None,
+        stats: RefreshStats | None = None,
     ) -> None:
         """Initialise."""
         super().__init__(host, user, pwd)
         self.message_callback = message_callback
+        # How long requests wait for an executor thread is recorded here
+        self.stats = stats or RefreshStats()
         self._task: asyncio.Task = None
 
     async def async_connect(self) -> bool:
@@ -144,8 +157,7 @@ class PushAPI(API):
 
     async def async_get_devices(self) -> list[Device]:
         """Async version of get_devices."""
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self.get_devices)
+        return await self.stats.async_run_in_executor(self.get_devices)
 
     async def async_update_devices(self) -> None:
         """Loop to send updated device data every 15s."""
@@ -153,7 +165,7 @@ class PushAPI(API):
             delay = randrange(10, 12)
             _LOGGER.debug("Next update for devices in %is", delay)
             await asyncio.sleep(delay)
-            devices = await self.get_devices()
+            devices = await self.async_get_devices()
             if asyncio.iscoroutinefunction(self.message_callback):
                 await self.message_callback(devices)
             else:
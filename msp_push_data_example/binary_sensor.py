@@ -57,6 +57,7 @@ class ExampleBinarySensor(CoordinatorEntity, BinarySensorEntity):
         self.device = self.coordinator.get_device_by_id(
             self.device.device_type, self.device_id
         )
+        self.coordinator.entity_writes += 1
         self.async_write_ha_state()
 
     @property
@@ -108,4 +109,7 @@ class ExampleBinarySensor(CoordinatorEntity, BinarySensorEntity):
         # Add any additional attributes you want on your sensor.
         attrs = {}
         attrs["extra_info"] = "Extra Info"
+        # Show that the state is from the cache until the api is read.
+        if self.coordinator.cache.restored:
+            attrs["restored"] = True
         return attrs
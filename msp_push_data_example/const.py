@@ -4,3 +4,6 @@ DOMAIN = "msp_push_data_example"
 
 DEFAULT_SCAN_INTERVAL = 60
 MIN_SCAN_INTERVAL = 10
+
+# Wait this many seconds after the api data changes before saving it to the cache
+CACHE_SAVE_DELAY = 60
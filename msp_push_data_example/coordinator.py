@@ -2,6 +2,7 @@
 
 from dataclasses import dataclass
 import logging
+import time
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -10,11 +11,19 @@ from homeassistant.const import (
     CONF_SCAN_INTERVAL,
     CONF_USERNAME,
 )
-from homeassistant.core import DOMAIN, HomeAssistant
+from homeassistant.core import DOMAIN, HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import APIAuthError, Device, DeviceType, PushAPI
+from .cache import SnapshotCache
 from .const import DEFAULT_SCAN_INTERVAL
+from .stats import (
+    DEVICE_COUNT,
+    ENTITY_WRITES,
+    FETCH_TIME,
+    UPDATE_ENTITIES_TIME,
+    RefreshStats,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -57,17 +66,31 @@ class ExampleCoordinator(DataUpdateCoordinator):
             update_interval=None,
         )
 
+        # Statistics of what our updates cost, recorded here and by the api.  They
+        # are shown on diagnostic sensors of the hub device.  See stats.py.
+        self.stats = RefreshStats()
+        # Counted by our device entities as they write their state
+        self.entity_writes = 0
+
         # Initialise your api here
         self.api = PushAPI(
             host=self.host,
             user=self.user,
             pwd=self.pwd,
             message_callback=self.devices_update_callback,
+            stats=self.stats,
         )
 
+        # The last good api data is saved, so on the next start entities can be
+        # created from it without waiting for the api.  See cache.py.
+        self.cache = SnapshotCache(hass, config_entry)
+
     async def devices_update_callback(self, devices: list[Device]):
         """Receive callback from api with device update."""
-        self.async_set_updated_data(ExampleAPIData(self.api.controller_name, devices))
+        data = ExampleAPIData(self.api.controller_name, devices)
+        self.stats.record(DEVICE_COUNT, len(devices))
+        self.async_save_cache(data)
+        self.async_set_updated_data(data)
 
     async def connect_api(self):
         """Connect to api."""
@@ -84,9 +107,11 @@ class ExampleCoordinator(DataUpdateCoordinator):
         so entities can quickly look up their data.
         """
         try:
+            started = time.perf_counter()
             if not self.api.connected:
                 await self.connect_api()
             devices = await self.api.async_get_devices()
+            self.stats.record_time(FETCH_TIME, started)
         except APIAuthError as err:
             _LOGGER.error(err)
             raise UpdateFailed(err) from err
@@ -94,8 +119,47 @@ class ExampleCoordinator(DataUpdateCoordinator):
             # This will show entities as unavailable by raising UpdateFailed exception
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
+        data = ExampleAPIData(self.api.controller_name, devices)
+        self.stats.record(DEVICE_COUNT, len(devices))
+        self.async_save_cache(data)
+
         # What is returned here is stored in self.data by the DataUpdateCoordinator
-        return ExampleAPIData(self.api.controller_name, devices)
+        return data
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all our entities, recording how long it took.
+
+        Called after every update, whether it was pushed to us or fetched.
+        """
+        started = time.perf_counter()
+        writes = self.entity_writes
+        super().async_update_listeners()
+        self.stats.record_time(UPDATE_ENTITIES_TIME, started)
+        self.stats.record(ENTITY_WRITES, self.entity_writes - writes)
+
+    async def async_load_cache(self) -> bool:
+        """Load the last saved api data into the coordinator.
+
+        Returns False if there is no saved data.
+        """
+        if not (cached := await self.cache.async_load()):
+            return False
+        self.data = ExampleAPIData(
+            cached["controller_name"],
+            [
+                Device(**device | {"device_type": DeviceType(device["device_type"])})
+                for device in cached["devices"]
+            ],
+        )
+        return True
+
+    @callback
+    def async_save_cache(self, data: ExampleAPIData) -> None:
+        """Save live api data to the cache."""
+        # Entities no longer show restored data
+        self.cache.restored = False
+        self.cache.async_save(data)
 
     async def async_shutdown(self) -> None:
         """Run shutdown clean up."""
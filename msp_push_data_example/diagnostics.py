@@ -0,0 +1,39 @@
+"""Diagnostics support for the Push Data Example integration.
+
+This adds a Download Diagnostics option to the integration, which gives a json
+file of whatever is returned here.  It is very useful for users to attach to
+issues.
+
+Make sure you redact anything sensitive, like passwords.
+
+https://developers.home-assistant.io/docs/core/integration_diagnostics
+"""
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from . import MyConfigEntry
+from .coordinator import ExampleCoordinator
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: MyConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: ExampleCoordinator = config_entry.runtime_data.coordinator
+
+    return {
+        "entry": {
+            "data": async_redact_data(config_entry.data, TO_REDACT),
+            "options": dict(config_entry.options),
+        },
+        "api_connected": coordinator.api.connected,
+        "last_update_success": coordinator.last_update_success,
+        "cache": coordinator.cache.as_dict(),
+        "statistics": coordinator.stats.as_dict(),
+    }
@@ -1,13 +1,15 @@
 """Interfaces with the Example api sensors."""
 
 import logging
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import EntityCategory, UnitOfTemperature, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -17,9 +19,50 @@ from . import MyConfigEntry
 from .api import Device, DeviceType
 from .const import DOMAIN
 from .coordinator import ExampleCoordinator
+from .stats import (
+    DEVICE_COUNT,
+    ENTITY_WRITES,
+    EXECUTOR_WAIT,
+    FETCH_TIME,
+    UPDATE_ENTITIES_TIME,
+    Histogram,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
+# The update statistics to show as sensors on the hub device.  See stats.py.
+HUB_STATISTIC_SENSORS = (
+    SensorEntityDescription(
+        key=FETCH_TIME,
+        name="Fetch time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key=DEVICE_COUNT,
+        name="Devices",
+    ),
+    SensorEntityDescription(
+        key=ENTITY_WRITES,
+        name="Entity writes per update",
+    ),
+    SensorEntityDescription(
+        key=UPDATE_ENTITIES_TIME,
+        name="Update entities time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=1,
+    ),
+    SensorEntityDescription(
+        key=EXECUTOR_WAIT,
+        name="Executor wait",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=1,
+    ),
+)
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -39,6 +82,12 @@ async def async_setup_entry(
         if device.device_type == DeviceType.TEMP_SENSOR
     ]
 
+    # Add the diagnostic sensors of our update statistics, on the hub device.
+    sensors.extend(
+        ExampleHubStatisticSensor(coordinator, config_entry, description)
+        for description in HUB_STATISTIC_SENSORS
+    )
+
     # Create the sensors.
     async_add_entities(sensors)
 
@@ -60,6 +109,7 @@ class ExampleSensor(CoordinatorEntity, SensorEntity):
             self.device.device_type, self.device_id
         )
         _LOGGER.debug("Device: %s", self.device)
+        self.coordinator.entity_writes += 1
         self.async_write_ha_state()
 
     @property
@@ -123,4 +173,69 @@ class ExampleSensor(CoordinatorEntity, SensorEntity):
         # Add any additional attributes you want on your sensor.
         attrs = {}
         attrs["extra_info"] = "Extra Info"
+        # Show that the state is from the cache until the api is read.
+        if self.coordinator.cache.restored:
+            attrs["restored"] = True
         return attrs
+
+
+class ExampleHubStatisticSensor(CoordinatorEntity, SensorEntity):
+    """Implementation of an update statistic sensor on the hub device.
+
+    The state is the last recorded value and the attributes summarise the
+    histogram of all of them.  The attributes change on every update, so they
+    are not recorded in the history database.
+    """
+
+    coordinator: ExampleCoordinator
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _unrecorded_attributes = frozenset({"count", "mean", "min", "max", "p50", "p95"})
+
+    def __init__(
+        self,
+        coordinator: ExampleCoordinator,
+        config_entry: MyConfigEntry,
+        description: SensorEntityDescription,
+    ) -> None:
+        """Initialise sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self.histogram: Histogram = coordinator.stats.histograms[description.key]
+        self._written_count = -1
+        self._attr_unique_id = f"{DOMAIN}-{config_entry.entry_id}-{description.key}"
+        self._attr_device_info = DeviceInfo(
+            name=config_entry.title,
+            manufacturer="ACME Manufacturer",
+            model="Hub",
+            identifiers={(DOMAIN, config_entry.entry_id)},
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only if a new value has been recorded."""
+        if self.histogram.count == self._written_count:
+            return
+        self._written_count = self.histogram.count
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        """Return True, as the statistics are still valid while the api is down."""
+        return True
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the state of the entity."""
+        return self.histogram.last
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the histogram summary."""
+        summary = self.histogram.as_dict()
+        return {
+            attribute: summary[attribute]
+            for attribute in ("count", "mean", "min", "max", "p50", "p95")
+        }